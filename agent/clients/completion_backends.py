@@ -0,0 +1,112 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Optional, TYPE_CHECKING
+
+from openai.types.chat import ChatCompletionChunk
+
+if TYPE_CHECKING:
+    from openai import AsyncAzureOpenAI
+
+
+def load_recordings(recording_path: str) -> list[dict[str, Any]]:
+    """Load recorded completions from JSONL file (one completion per line)"""
+    with open(recording_path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_recording(recording_path: str, request: dict[str, Any], chunks: list[dict[str, Any]]) -> None:
+    """Append one recorded completion (request + streamed chunks) to JSONL file"""
+    with open(recording_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"request": request, "chunks": chunks}, ensure_ascii=False) + "\n")
+
+
+class RecordingCompletionClient:
+    """Wraps real OpenAI client and records every streamed chat completion to disk"""
+
+    def __init__(self, client: 'AsyncAzureOpenAI', recording_path: str) -> None:
+        self.client = client
+        self.recording_path = recording_path
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs) -> Any:
+        response = await self.client.chat.completions.create(**kwargs)
+        if not kwargs.get("stream"):
+            return response
+        return self._record_stream(kwargs, response)
+
+    async def _record_stream(self, request: dict[str, Any], stream) -> AsyncIterator[ChatCompletionChunk]:
+        chunks = []
+        async for chunk in stream:
+            chunks.append(chunk.model_dump(exclude_none=True))
+            yield chunk
+
+        # Only fully consumed streams are persisted, partial ones can't be replayed faithfully
+        append_recording(self.recording_path, request, chunks)
+
+
+class ReplayCompletionClient:
+    """
+    OpenAI-compatible stand-in that replays recorded streaming completions (including tool call deltas).
+    Each `chat.completions.create` call returns next recorded completion, request arguments are ignored.
+    """
+
+    def __init__(
+            self,
+            recordings: list[dict[str, Any]],
+            tokens_per_second: Optional[float] = None,
+            cycle: bool = False
+    ) -> None:
+        if not recordings:
+            raise ValueError("At least one recorded completion is required")
+
+        self.recordings = recordings
+        # Chunks are validated once up front so that replay itself measures only streaming overhead
+        self._chunks = [
+            [ChatCompletionChunk.model_validate(chunk) for chunk in recording["chunks"]]
+            for recording in recordings
+        ]
+        self.tokens_per_second = tokens_per_second
+        self.cycle = cycle
+        self._position = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    @classmethod
+    def from_file(
+            cls,
+            recording_path: str,
+            tokens_per_second: Optional[float] = None,
+            cycle: bool = False
+    ) -> 'ReplayCompletionClient':
+        """Create replay client from JSONL file produced by RecordingCompletionClient"""
+        return cls(load_recordings(recording_path), tokens_per_second=tokens_per_second, cycle=cycle)
+
+    def reset(self) -> None:
+        """Start replaying from the first recorded completion again"""
+        self._position = 0
+
+    async def _create(self, **kwargs) -> AsyncIterator[ChatCompletionChunk]:
+        if self._position >= len(self.recordings):
+            if not self.cycle:
+                raise RuntimeError(f"Replay exhausted: only {len(self.recordings)} completions were recorded")
+            self._position = 0
+
+        chunks = self._chunks[self._position]
+        self._position += 1
+        return self._replay_stream(chunks)
+
+    async def _replay_stream(self, chunks: list[ChatCompletionChunk]) -> AsyncIterator[ChatCompletionChunk]:
+        if not self.tokens_per_second:
+            for chunk in chunks:
+                yield chunk
+            return
+
+        # One chunk is treated as one token, schedule is absolute to avoid drift from sleep overshoot
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.tokens_per_second
+        started_at = loop.time()
+        for i, chunk in enumerate(chunks):
+            delay = started_at + i * interval - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield chunk
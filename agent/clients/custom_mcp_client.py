@@ -6,6 +6,20 @@ import aiohttp
 
 MCP_SESSION_ID_HEADER = "Mcp-Session-Id"
 
+
+def _accepted_encodings() -> str:
+    """Content encodings aiohttp is able to decode in this environment (br and zstd need optional packages)"""
+    from aiohttp import compression_utils
+
+    encodings = []
+    if getattr(compression_utils, "HAS_ZSTD", False):
+        encodings.append("zstd")
+    if getattr(compression_utils, "HAS_BROTLI", False):
+        encodings.append("br")
+    encodings.extend(["gzip", "deflate"])
+    return ", ".join(encodings)
+
+
 class CustomMCPClient:
     """Pure Python MCP client without external MCP libraries"""
 
@@ -21,128 +35,134 @@ class CustomMCPClient:
         await instance.connect()
         return instance
 
+    def _headers(self) -> dict[str, str]:
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json, text/event-stream",
+            # Compressed responses (JSON and SSE) are transparently decoded by aiohttp
+            "Accept-Encoding": _accepted_encodings(),
+        }
+        if self.session_id:
+            headers[MCP_SESSION_ID_HEADER] = self.session_id
+        return headers
+
     async def _send_request(self, method: str, params: Optional[dict[str, Any]] = None) -> dict[str, Any]:
         """Send JSON-RPC request to MCP server"""
-        #TODO:
-        # 1. Check session is present
-        # 2. Prepare request body and don't forget to add parameters there if they are present. Sample of request body see in Postman collection
-        # 3. Prepare headers dict. Remember that according to protocol MCP Server Accept application/json and text/event-stream
-        # 4. Add session ID header for non-initialize requests (notify, discovery, operation):
-        # 5. Make POST request using `self.http_session.post()` as `response` with:
-        #       - url: self.server_url
-        #       - json: request_data
-        #       - headers: headers
-        #    And:
-        #       - If `not self.session_id` and `response.headers.get(MCP_SESSION_ID_HEADER)` exists, set `self.session_id = response.headers[MCP_SESSION_ID_HEADER]`
-        #       - If `response.status == 202`, return empty dict `{}` (successful notification)
-        #       - Get `content-type` from response headers
-        #       - If `'text/event-stream' in content_type.lower()`:
-        #           - call `await self._parse_sse_response_streaming(response)` and assign to `response_data`
-        #         Otherwise call `await response.json()` and assign to `response_data`
-        #       - If "error" in `response_data`, extract `error = response_data["error"]` and raise RuntimeError(f"MCP Error {error['code']}: {error['message']}")
-        #       - Return `response_data`
-        raise NotImplementedError()
+        if self.http_session is None:
+            raise RuntimeError("HTTP session not initialized")
+
+        request_data = {
+            "jsonrpc": "2.0",
+            "id": str(uuid.uuid4()),
+            "method": method,
+        }
+        if params:
+            request_data["params"] = params
 
+        async with self.http_session.post(self.server_url, json=request_data, headers=self._headers()) as response:
+            if not self.session_id and response.headers.get(MCP_SESSION_ID_HEADER):
+                self.session_id = response.headers[MCP_SESSION_ID_HEADER]
+
+            if response.status == 202:
+                return {}
+
+            content_type = response.headers.get("content-type", "")
+            if 'text/event-stream' in content_type.lower():
+                response_data = await self._parse_sse_response_streaming(response)
+            else:
+                response_data = await response.json()
+
+            if "error" in response_data:
+                error = response_data["error"]
+                raise RuntimeError(f"MCP Error {error['code']}: {error['message']}")
+
+            return response_data
 
     async def _parse_sse_response_streaming(self, response: aiohttp.ClientResponse) -> dict[str, Any]:
         """Parse Server-Sent Events response with streaming"""
-        #TODO:
-        # Response stream sample:
-        # data: {
-        #     "jsonrpc": "2.0",
-        #     "id": 1,
-        #     "result": {
-        #         "content": [
-        #             {
-        #                 "type": "text",
-        #                 "text": "some tool call result"
-        #             }
-        #         ]
-        #     }
-        # }
-        # data: [DONE]
-        # ---
-        # 1. Make async loop from the `response.content`
-        #       - create `line_str` from `line.decode('utf-8').strip()`
-        #       - if line is not present or starts with ':' skip iteration (with continue)
-        #       - if line starts with 'data: ' then:
-        #           - extract data part: `data_part = line[6:]` (remove 'data: ' prefix)
-        #           - If `data_part != '[DONE]'`, then `return json.loads(data_part)` (we just need first chunk since MCP tool returns response with 1 chunk)
-        # 2. raise RuntimeError("No valid data found in SSE response")
-
-        raise NotImplementedError()
+        async for line in response.content:
+            line_str = line.decode('utf-8').strip()
+            if not line_str or line_str.startswith(':'):
+                continue
+
+            if line_str.startswith('data: '):
+                data_part = line_str[6:]
+                if data_part != '[DONE]':
+                    return json.loads(data_part)
+
+        raise RuntimeError("No valid data found in SSE response")
 
     async def connect(self) -> None:
         """Connect to MCP server and initialize session"""
-        #TODO:
-        # 1. Set up aiohttp.ClientTimeout with `total=30, connect=10`
-        # 2. Set up aiohttp.TCPConnector with `limit=100, limit_per_host=10`
-        # 2. Set up  HTTP session: aiohttp.ClientSession with `timeout=timeout, connector=connector`
-        # 3. Try-except block:
-        #       - Create `init_params` dictionary with:
-        #           - "protocolVersion": "2024-11-05"
-        #           - "capabilities": {"tools": {}}
-        #           - "clientInfo": {"name": "my-custom-mcp-client", "version": "1.0.0"}
-        #       - Call `await self._send_request("initialize", init_params)` and save result into variable (to print later capabilities of MCP Server)
-        #       - Call `await self._send_notification("notifications/initialized")`
-        #       - Print capabilities (from init request)
-        # 4. Catch Exception as `e` and raise RuntimeError(f"Failed to connect to MCP server: {e}")
-        raise NotImplementedError()
+        timeout = aiohttp.ClientTimeout(total=30, connect=10)
+        connector = aiohttp.TCPConnector(limit=100, limit_per_host=10)
+        self.http_session = aiohttp.ClientSession(timeout=timeout, connector=connector, auto_decompress=True)
+
+        try:
+            init_params = {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {"tools": {}},
+                "clientInfo": {"name": "my-custom-mcp-client", "version": "1.0.0"}
+            }
+            init_result = await self._send_request("initialize", init_params)
+            await self._send_notification("notifications/initialized")
+            print(json.dumps(init_result.get("result", {}).get("capabilities", {}), indent=2))
+        except Exception as e:
+            raise RuntimeError(f"Failed to connect to MCP server: {e}")
 
     async def _send_notification(self, method: str) -> None:
         """Send notification (no response expected)"""
-        #TODO:
-        # 1. Check if `self.http_session` is None, raise RuntimeError("HTTP session not initialized")
-        # 2. Create `request_data` dictionary with:
-        #       - "jsonrpc": "2.0"
-        #       - "method": method
-        # 3. Create `headers` dictionary with:
-        #       - "Content-Type": "application/json"
-        #       - "Accept": "application/json, text/event-stream" (Pay attention that it required both!)
-        # 4. If `self.session_id` exists, add `headers[MCP_SESSION_ID_HEADER] = self.session_id`
-        # 5. Make async POST request using `self.http_session.post()` as `response` with:
-        #       - url: self.server_url
-        #       - json: request_data
-        #       - headers: headers
-        #    If MCP_SESSION_ID_HEADER exists in `response.headers`, set `self.session_id = response.headers[MCP_SESSION_ID_HEADER]` and print session ID
-        raise NotImplementedError()
+        if self.http_session is None:
+            raise RuntimeError("HTTP session not initialized")
+
+        request_data = {
+            "jsonrpc": "2.0",
+            "method": method
+        }
+
+        async with self.http_session.post(self.server_url, json=request_data, headers=self._headers()) as response:
+            if MCP_SESSION_ID_HEADER in response.headers:
+                self.session_id = response.headers[MCP_SESSION_ID_HEADER]
+                print(f"Session ID: {self.session_id}")
 
     async def get_tools(self) -> list[dict[str, Any]]:
         """Get available tools from MCP server"""
-        #TODO:
-        # 1. Check if session is present
-        # 2. Send request with method `tools/list`
-        # 3. Extract tools from response. See response sample in postman
-        # 4. Return list with dicts with tool schemas. It should be provided according to DIAL specification
-        # https://dialx.ai/dial_api#operation/sendChatCompletionRequest (request -> tools)
-        raise NotImplementedError()
-
-    async def call_tool(self, tool_name: str, tool_args: dict[str, Any]) -> Any:
-        """Call a specific tool on the MCP server"""
-        #TODO:
-        # 1. Check if `self.http_session` is None, raise RuntimeError("MCP client not connected. Call connect() first.") if so
-        # 2. print(f"    Calling `{tool_name}` with {tool_args}")
-        # 3. Create `params` dictionary with:
-        #       - "name": tool_name
-        #       - "arguments": tool_args
-        # 4. Call `await self._send_request("tools/call", params)` and assign to `response`
-        #       response sample:
-        #       {
-        #           "jsonrpc": "2.0",
-        #           "id": 1,
-        #           "result": {
-        #               "content": [
-        #                   {
-        #                       "type": "text",
-        #                       "text": "some tool call result"
-        #                   }
-        #                ]
-        #           }
-        #       }
-        # 5. Extract content using walrus operator: `if content:= response["result"].get("content", [])`
-        # 6. Extract first item using walrus operator: `if item := content[0]`
-        # 7. Extract text result: `text_result = item.get("text", "")`
-        # 8. print(f"    ⚙️: {text_result}\n")
-        # 9. Return `text_result`
-        # 10. If no content found, return "Unexpected error occurred!"
-        raise NotImplementedError()
\ No newline at end of file
+        if not self.session_id:
+            raise RuntimeError("MCP client not connected. Call connect() first.")
+
+        response = await self._send_request("tools/list")
+        tools = response["result"].get("tools", [])
+        return [
+            {
+                "type": "function",
+                "function": {
+                    "name": tool["name"],
+                    "description": tool["description"],
+                    "parameters": tool["inputSchema"]
+                }
+            }
+            for tool in tools
+        ]
+
+    async def call_tool(self, tool_name: str, tool_args: dict[str, Any], timeout: Optional[float] = None) -> Any:
+        """Call a specific tool on the MCP server, `timeout` (seconds) is passed to server as request deadline"""
+        if self.http_session is None:
+            raise RuntimeError("MCP client not connected. Call connect() first.")
+
+        print(f"    Calling `{tool_name}` with {tool_args}")
+
+        params = {
+            "name": tool_name,
+            "arguments": tool_args
+        }
+        if timeout:
+            params["_meta"] = {"timeout": timeout}
+        response = await self._send_request("tools/call", params)
+
+        if content := response["result"].get("content", []):
+            if item := content[0]:
+                text_result = item.get("text", "")
+                print(f"    ⚙️: {text_result}\n")
+                return text_result
+
+        return "Unexpected error occurred!"
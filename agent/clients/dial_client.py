@@ -1,12 +1,17 @@
 import json
-from collections import defaultdict
-from typing import Any
+from typing import Any, TYPE_CHECKING
 
-from openai import AsyncAzureOpenAI
-
-from agent.clients.custom_mcp_client import CustomMCPClient
+from agent.clients.output_sinks import OutputSink, ConsoleSink
+from agent.clients.stream_accumulator import StreamAccumulator
+from agent.clients.tool_output_store import ToolOutputStore
 from agent.models.message import Message, Role
-from agent.clients.mcp_client import MCPClient
+
+if TYPE_CHECKING:
+    # Only for annotations: importing them eagerly pulls in openai, aiohttp and mcp SDK on every start
+    from openai import AsyncAzureOpenAI
+    from agent.clients.completion_backends import RecordingCompletionClient, ReplayCompletionClient
+    from agent.clients.custom_mcp_client import CustomMCPClient
+    from agent.clients.mcp_client import MCPClient
 
 
 class DialClient:
@@ -17,28 +22,32 @@ class DialClient:
             api_key: str,
             endpoint: str,
             tools: list[dict[str, Any]],
-            tool_name_client_map: dict[str, MCPClient | CustomMCPClient]
+            tool_name_client_map: dict[str, 'MCPClient | CustomMCPClient'],
+            completion_client: 'AsyncAzureOpenAI | RecordingCompletionClient | ReplayCompletionClient | None' = None,
+            output_sink: OutputSink | None = None
     ):
         self.tools = tools
         self.tool_name_client_map = tool_name_client_map
-        self.openai = AsyncAzureOpenAI(
-            api_key=api_key,
-            azure_endpoint=endpoint,
-            api_version=""
-        )
+        self.output = output_sink or ConsoleSink()
+        # Repeated tool results are kept in history once
+        self.tool_outputs = ToolOutputStore()
+        # Any OpenAI-compatible backend can be plugged in (e.g. replay of recorded sessions for offline benchmarks),
+        # openai SDK is imported only when real client is needed
+        if completion_client is None:
+            from openai import AsyncAzureOpenAI
+
+            completion_client = AsyncAzureOpenAI(
+                api_key=api_key,
+                azure_endpoint=endpoint,
+                api_version=""
+            )
+        self.openai = completion_client
 
     def _collect_tool_calls(self, tool_deltas):
         """Convert streaming tool call deltas to complete tool calls"""
-        tool_dict = defaultdict(lambda: {"id": None, "function": {"arguments": "", "name": None}, "type": None})
-
-        for delta in tool_deltas:
-            idx = delta.index
-            if delta.id: tool_dict[idx]["id"] = delta.id
-            if delta.function.name: tool_dict[idx]["function"]["name"] = delta.function.name
-            if delta.function.arguments: tool_dict[idx]["function"]["arguments"] += delta.function.arguments
-            if delta.type: tool_dict[idx]["type"] = delta.type
-
-        return list(tool_dict.values())
+        accumulator = StreamAccumulator()
+        accumulator.add_tool_calls(tool_deltas)
+        return accumulator.tool_calls
 
     async def _stream_response(self, messages: list[Message]) -> Message:
         """Stream OpenAI response and handle tool calls"""
@@ -52,27 +61,29 @@ class DialClient:
             }
         )
 
-        content = ""
-        tool_deltas = []
+        accumulator = StreamAccumulator()
 
-        print("🤖: ", end="", flush=True)
+        self.output.write("🤖: ")
 
         async for chunk in stream:
+            # Azure may send chunks without choices (e.g. prompt filter results)
+            if not chunk.choices:
+                continue
             delta = chunk.choices[0].delta
 
             # Stream content
             if delta.content:
-                print(delta.content, end="", flush=True)
-                content += delta.content
+                self.output.write(delta.content)
+                accumulator.add_content(delta.content)
 
             if delta.tool_calls:
-                tool_deltas.extend(delta.tool_calls)
+                accumulator.add_tool_calls(delta.tool_calls)
 
-        print()
+        self.output.end()
         return Message(
             role=Role.AI,
-            content=content,
-            tool_calls=self._collect_tool_calls(tool_deltas) if tool_deltas else []
+            content=accumulator.content,
+            tool_calls=accumulator.tool_calls
         )
 
     async def get_completion(self, messages: list[Message]) -> Message:
@@ -105,7 +116,7 @@ class DialClient:
                 messages.append(
                     Message(
                         role=Role.TOOL,
-                        content=str(tool_result),
+                        content=self.tool_outputs.put(str(tool_result)),
                         tool_call_id=tool_call["id"],
                     )
                 )
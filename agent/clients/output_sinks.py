@@ -0,0 +1,64 @@
+import sys
+from typing import Protocol, TextIO
+
+
+class OutputSink(Protocol):
+    """Destination for streamed assistant output"""
+
+    def write(self, text: str) -> None: ...
+
+    def end(self) -> None: ...
+
+
+class ConsoleSink:
+    """Writes every chunk to console and flushes immediately (lowest latency, one syscall per chunk)"""
+
+    def __init__(self, stream: TextIO | None = None) -> None:
+        self.stream = stream
+
+    def write(self, text: str) -> None:
+        stream = self.stream or sys.stdout
+        stream.write(text)
+        stream.flush()
+
+    def end(self) -> None:
+        self.write("\n")
+
+
+class BufferedConsoleSink:
+    """Collects chunks and writes them to console when buffered text reaches `flush_threshold` chars or on newline"""
+
+    def __init__(self, stream: TextIO | None = None, flush_threshold: int = 256) -> None:
+        self.stream = stream
+        self.flush_threshold = flush_threshold
+        self._parts: list[str] = []
+        self._size = 0
+
+    def write(self, text: str) -> None:
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.flush_threshold or "\n" in text:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._parts:
+            return
+        stream = self.stream or sys.stdout
+        stream.write("".join(self._parts))
+        stream.flush()
+        self._parts.clear()
+        self._size = 0
+
+    def end(self) -> None:
+        self._parts.append("\n")
+        self.flush()
+
+
+class NullSink:
+    """Discards output, for benchmarks and non-interactive runs"""
+
+    def write(self, text: str) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
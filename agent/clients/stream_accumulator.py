@@ -0,0 +1,43 @@
+from typing import Any
+
+
+class StreamAccumulator:
+    """
+    Incrementally builds assistant message from streamed deltas.
+    Content and tool call arguments are kept as lists of chunks and joined once, when the stream is finished,
+    instead of re-concatenating strings on every delta.
+    """
+
+    def __init__(self) -> None:
+        self._content_parts: list[str] = []
+        self._tool_calls: dict[int, dict[str, Any]] = {}
+        self._arguments_parts: dict[int, list[str]] = {}
+
+    def add_content(self, content: str) -> None:
+        self._content_parts.append(content)
+
+    def add_tool_calls(self, tool_deltas) -> None:
+        """Merge tool call deltas into per-index tool calls"""
+        for delta in tool_deltas:
+            idx = delta.index
+            tool_call = self._tool_calls.get(idx)
+            if tool_call is None:
+                tool_call = {"id": None, "function": {"arguments": "", "name": None}, "type": None}
+                self._tool_calls[idx] = tool_call
+                self._arguments_parts[idx] = []
+
+            if delta.id: tool_call["id"] = delta.id
+            if delta.type: tool_call["type"] = delta.type
+            if function := delta.function:
+                if function.name: tool_call["function"]["name"] = function.name
+                if function.arguments: self._arguments_parts[idx].append(function.arguments)
+
+    @property
+    def content(self) -> str:
+        return "".join(self._content_parts)
+
+    @property
+    def tool_calls(self) -> list[dict[str, Any]]:
+        for idx, tool_call in self._tool_calls.items():
+            tool_call["function"]["arguments"] = "".join(self._arguments_parts[idx])
+        return list(self._tool_calls.values())
@@ -0,0 +1,30 @@
+import hashlib
+
+
+class ToolOutputStore:
+    """
+    Content-addressed store of tool outputs of one conversation.
+    Identical outputs (same user record fetched again, same page, ...) resolve to one shared string,
+    so history memory grows with unique content only.
+    """
+
+    def __init__(self) -> None:
+        self._outputs: dict[bytes, str] = {}
+        self.stored_bytes = 0
+        self.deduplicated_bytes = 0
+
+    def put(self, output: str) -> str:
+        """Returns stored instance of `output`, the same object for every identical payload"""
+        encoded = output.encode("utf-8")
+        digest = hashlib.blake2b(encoded, digest_size=16).digest()
+        stored = self._outputs.get(digest)
+        if stored is not None:
+            self.deduplicated_bytes += len(encoded)
+            return stored
+
+        self._outputs[digest] = output
+        self.stored_bytes += len(encoded)
+        return output
+
+    def __len__(self) -> int:
+        return len(self._outputs)
@@ -16,8 +16,27 @@ class Message(BaseModel):
     tool_call_id: str | None = None
     name: str | None = None
     tool_calls: list[dict[str, Any]] | None = None
+    # History is sent with every request, dict is built once per message and rebuilt only after fields are reassigned.
+    # Kept in a slot: pydantic private attributes are slower to read than building the dict
+    __slots__ = ("_request_dict",)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        object.__setattr__(self, "_request_dict", None)
 
     def to_dict(self) -> dict[str, Any]:
+        """Request representation of message, shared between calls: don't modify it"""
+        try:
+            request_dict = self._request_dict
+        except AttributeError:
+            # Not set for instances created without __init__ (model_copy, model_construct)
+            request_dict = None
+        if request_dict is None:
+            request_dict = self._build_dict()
+            object.__setattr__(self, "_request_dict", request_dict)
+        return request_dict
+
+    def _build_dict(self) -> dict[str, Any]:
         result = {"role": str(self.role.value)}
         if self.content:
             result["content"] = self.content
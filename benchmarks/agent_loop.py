@@ -0,0 +1,89 @@
+"""
+Offline benchmark of DialClient agent loop overhead.
+
+Replays recorded (or synthetic) streaming completions through ReplayCompletionClient and measures
+`_stream_response`, `_collect_tool_calls` and `_call_tools` in isolation.
+
+    python -m benchmarks.agent_loop
+    python -m benchmarks.agent_loop --recording session.jsonl --tokens-per-second 50
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+import time
+
+from agent.clients.completion_backends import ReplayCompletionClient, load_recordings
+from agent.clients.dial_client import DialClient
+from agent.models.message import Message, Role
+from benchmarks.fixtures import StaticToolClient, synthetic_completion
+
+
+def _report(name: str, samples: list[float]) -> None:
+    samples_us = sorted(s * 1e6 for s in samples)
+    p95 = samples_us[int(len(samples_us) * 0.95) - 1] if len(samples_us) >= 20 else samples_us[-1]
+    print(f"{name:<22} mean {statistics.mean(samples_us):>10.1f} us   p50 {statistics.median(samples_us):>10.1f} us   p95 {p95:>10.1f} us")
+
+
+async def run(recordings: list[dict], iterations: int, tokens_per_second: float | None) -> None:
+    replay = ReplayCompletionClient(recordings, tokens_per_second=tokens_per_second, cycle=True)
+    tool_result = "```\n" + "".join(f"  field_{i}: value_{i}\n" for i in range(20)) + "```\n"
+    client = DialClient(
+        api_key="offline",
+        endpoint="http://offline",
+        tools=[],
+        tool_name_client_map={"get_user_by_id": StaticToolClient(tool_result)},
+        completion_client=replay,
+    )
+    messages = [Message(role=Role.USER, content="benchmark")]
+
+    stream_samples, collect_samples, call_samples = [], [], []
+    for _ in range(iterations):
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            ai_message = await client._stream_response(messages)
+            stream_samples.append(time.perf_counter() - started)
+
+            if ai_message.tool_calls:
+                started = time.perf_counter()
+                await client._call_tools(ai_message, [])
+                call_samples.append(time.perf_counter() - started)
+
+    # `_collect_tool_calls` is measured on raw deltas of every recorded completion with tool calls
+    replay.reset()
+    for _ in range(iterations):
+        stream = await replay.chat.completions.create()
+        deltas = [tc async for chunk in stream for tc in (chunk.choices[0].delta.tool_calls or [])]
+        if deltas:
+            started = time.perf_counter()
+            client._collect_tool_calls(deltas)
+            collect_samples.append(time.perf_counter() - started)
+
+    _report("_stream_response", stream_samples)
+    if collect_samples:
+        _report("_collect_tool_calls", collect_samples)
+    if call_samples:
+        _report("_call_tools", call_samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recording", help="JSONL file recorded with RecordingCompletionClient")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--tokens-per-second", type=float, default=None, help="Replay rate, unlimited by default")
+    args = parser.parse_args()
+
+    if args.recording:
+        recordings = load_recordings(args.recording)
+    else:
+        recordings = [
+            synthetic_completion(content_tokens=20, tool_calls=2, argument_chunks=64),
+            synthetic_completion(content_tokens=400),
+        ]
+
+    asyncio.run(run(recordings, args.iterations, args.tokens_per_second))
+
+
+if __name__ == "__main__":
+    main()
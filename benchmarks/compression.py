@@ -0,0 +1,46 @@
+"""
+Benchmark of /mcp response compression: bytes on the wire and CPU cost per response size.
+
+Every available encoder (zstd and br only when `zstandard`/`brotli` are installed) compresses
+`tools/call` SSE responses with `search_users` results of growing size.
+
+    python -m benchmarks.compression
+"""
+import argparse
+import json
+import time
+
+from benchmarks.fixtures import synthetic_users
+from mcp_server.middleware.compression import available_encoders
+from mcp_server.tools.users.user_formatter import format_users
+
+
+def _sse_response(users_count: int) -> bytes:
+    # Default (markdown) format is exactly what search_users sends back
+    text = format_users(synthetic_users(users_count))
+    message = {"jsonrpc": "2.0", "id": 1, "result": {"content": [{"type": "text", "text": text}]}}
+    return f"data: {json.dumps(message)}\n\n".encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000], help="Users per response")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    encoders = available_encoders()
+    print(f"{'users':>6} {'encoding':>9} {'bytes':>10} {'ratio':>7} {'cpu/resp':>12}")
+    for size in args.sizes:
+        payload = _sse_response(size)
+        print(f"{size:>6} {'identity':>9} {len(payload):>10} {1:>7.2f} {'-':>12}")
+        for name, encoder_cls in encoders.items():
+            started = time.process_time()
+            for _ in range(args.iterations):
+                encoder = encoder_cls()
+                compressed = encoder.compress(payload) + encoder.compress(b"data: [DONE]\n\n") + encoder.finish()
+            cpu_us = (time.process_time() - started) / args.iterations * 1e6
+            print(f"{size:>6} {name:>9} {len(compressed):>10} {len(payload) / len(compressed):>7.2f} {cpu_us:>9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import json
+from typing import Any
+
+
+def _chunk(delta: dict[str, Any], finish_reason: str | None = None) -> dict[str, Any]:
+    return {
+        "id": "chatcmpl-synthetic",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": "gpt-4o",
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+def synthetic_completion(
+        content_tokens: int = 0,
+        tool_calls: int = 0,
+        argument_chunks: int = 0,
+        argument_chunk_size: int = 8
+) -> dict[str, Any]:
+    """Build recorded completion in the same format as RecordingCompletionClient produces"""
+    chunks = [_chunk({"role": "assistant"})]
+
+    for i in range(content_tokens):
+        chunks.append(_chunk({"content": f"tok{i} "}))
+
+    for idx in range(tool_calls):
+        chunks.append(_chunk({"tool_calls": [{
+            "index": idx,
+            "id": f"call_{idx}",
+            "type": "function",
+            "function": {"name": "get_user_by_id", "arguments": ""},
+        }]}))
+        arguments = json.dumps({"id": idx, "padding": "x" * (argument_chunks * argument_chunk_size)})
+        for start in range(0, len(arguments), argument_chunk_size):
+            chunks.append(_chunk({"tool_calls": [{
+                "index": idx,
+                "function": {"arguments": arguments[start:start + argument_chunk_size]},
+            }]}))
+
+    chunks.append(_chunk({}, finish_reason="tool_calls" if tool_calls else "stop"))
+    return {"request": {"model": "gpt-4o", "stream": True}, "chunks": chunks}
+
+
+class StaticToolClient:
+    """MCP client stand-in that returns the same payload for every tool call"""
+
+    def __init__(self, result: str) -> None:
+        self.result = result
+
+    async def call_tool(self, tool_name: str, tool_args: dict[str, Any]) -> Any:
+        return self.result
+
+
+def synthetic_users(count: int) -> list[dict[str, Any]]:
+    """Users shaped like UMS service responses"""
+    return [
+        {
+            "id": i,
+            "name": f"Name{i}",
+            "surname": f"Surname{i}",
+            "email": f"user{i}@example.com",
+            "phone": f"+1-555-{i:07d}",
+            "date_of_birth": "1990-01-01",
+            "address": {"country": "USA", "city": "Springfield", "street": f"{i} Main St", "flat_house": f"{i % 100}"},
+            "gender": "female" if i % 2 else "male",
+            "company": f"Company {i % 50}",
+            "salary": 50000.0 + i,
+            "about_me": f"I am user number {i}. I like hiking, reading and long walks on the beach.",
+            "credit_card": {"num": f"4111-1111-1111-{i % 10000:04d}", "cvv": f"{i % 1000:03d}", "exp_date": "12/30"},
+        }
+        for i in range(count)
+    ]
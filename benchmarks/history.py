@@ -0,0 +1,101 @@
+"""
+Benchmark of agent conversation history growth when tools return the same payloads again and again:
+memory held by history and time to build request messages (`to_dict` of every message) per turn,
+with plain messages vs tool output deduplication and cached `to_dict`.
+
+    python -m benchmarks.history --turns 200 --unique-results 5
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from agent.clients.dial_client import DialClient
+from agent.models.message import Message, Role
+from benchmarks.fixtures import synthetic_users
+from mcp_server.tools.users.user_formatter import format_users
+
+
+class _RepeatingToolClient:
+    """Cycles through results, returning a fresh string every call as a real MCP client does"""
+
+    def __init__(self, results: list[str]) -> None:
+        self.results = results
+        self.calls = 0
+
+    async def call_tool(self, tool_name: str, tool_args: dict) -> str:
+        result = self.results[self.calls % len(self.results)]
+        self.calls += 1
+        return "".join([result[:1], result[1:]])
+
+
+def _ai_message(turn: int) -> Message:
+    return Message(
+        role=Role.AI,
+        tool_calls=[{"id": f"call_{turn}", "type": "function", "function": {"name": "search_users", "arguments": "{}"}}],
+    )
+
+
+async def _run(deduplicate: bool, turns: int, results: list[str], trace_memory: bool) -> tuple[float, float, float]:
+    tool_client = _RepeatingToolClient(results)
+    client = DialClient(
+        api_key="offline",
+        endpoint="http://offline",
+        tools=[],
+        tool_name_client_map={"search_users": tool_client},
+        completion_client=object(),
+    )
+    messages = [Message(role=Role.USER, content="benchmark")]
+
+    if trace_memory:
+        tracemalloc.start()
+    total_serialization = last_serialization = 0.0
+    for turn in range(turns):
+        ai_message = _ai_message(turn)
+        messages.append(ai_message)
+        if deduplicate:
+            await client._call_tools(ai_message, messages)
+        else:
+            result = await tool_client.call_tool("search_users", {})
+            messages.append(Message(role=Role.TOOL, content=result, tool_call_id=ai_message.tool_calls[0]["id"]))
+
+        started = time.perf_counter()
+        if deduplicate:
+            request_messages = [message.to_dict() for message in messages]
+        else:
+            # Uncached representation, as every request used to build it
+            request_messages = [message._build_dict() for message in messages]
+        last_serialization = time.perf_counter() - started
+        total_serialization += last_serialization
+        del request_messages
+
+    memory = 0
+    if trace_memory:
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return memory, total_serialization, last_serialization
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--unique-results", type=int, default=5, help="Distinct tool payloads in conversation")
+    parser.add_argument("--users-per-result", type=int, default=20)
+    args = parser.parse_args()
+
+    users = synthetic_users(args.unique_results * args.users_per_result)
+    results = [
+        format_users(users[i * args.users_per_result:(i + 1) * args.users_per_result])
+        for i in range(args.unique_results)
+    ]
+
+    print(f"{'history':<14} {'memory':>12} {'to_dict total':>15} {'last turn':>12}")
+    for name, deduplicate in (("plain", False), ("deduplicated", True)):
+        # Memory is traced in a separate run, tracing slows allocations down and would skew timings
+        memory, _, _ = asyncio.run(_run(deduplicate, args.turns, results, trace_memory=True))
+        _, total, last = asyncio.run(_run(deduplicate, args.turns, results, trace_memory=False))
+        print(f"{name:<14} {memory / 1024:>9.0f} KB {total * 1e3:>12.2f} ms {last * 1e6:>9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Cold start benchmark: import time of MCP server and agent modules (each in a fresh interpreter, with the list of
+heavy packages it pulled in) and time from process spawn to the first `initialize` response of MCP server.
+
+    python -m benchmarks.startup
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SERVER_DIR = ROOT / "mcp_server"
+HEAVY_PACKAGES = ("openai", "aiohttp", "mcp", "fastapi", "uvicorn", "pydantic")
+
+IMPORT_SNIPPET = """
+import sys, time, json
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"elapsed": elapsed, "loaded": [p for p in {packages!r} if p in sys.modules]}}))
+"""
+
+# (module, working directory): server.py is started from its own directory, as uvicorn does
+MODULES = [
+    ("server", SERVER_DIR),
+    ("mcp_server.services.mcp_server", ROOT),
+    ("agent.clients.dial_client", ROOT),
+    ("agent.clients.custom_mcp_client", ROOT),
+    ("agent.clients.mcp_client", ROOT),
+]
+
+
+def _env() -> dict[str, str]:
+    return {**os.environ, "PYTHONPATH": os.pathsep.join([str(ROOT), str(SERVER_DIR)])}
+
+
+def measure_import(module: str, cwd: Path, runs: int) -> tuple[float, list[str]] | None:
+    samples, loaded = [], []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET.format(module=module, packages=HEAVY_PACKAGES)],
+            cwd=cwd, env=_env(), capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            return None
+        data = json.loads(result.stdout.strip().splitlines()[-1])
+        samples.append(data["elapsed"])
+        loaded = data["loaded"]
+    return statistics.median(samples), loaded
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_initialize(timeout: float = 30) -> float:
+    port = _free_port()
+    body = json.dumps({
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {"protocolVersion": "2024-11-05", "capabilities": {}, "clientInfo": {"name": "bench", "version": "1"}}
+    }).encode()
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server:app", "--port", str(port), "--log-level", "warning"],
+        cwd=SERVER_DIR, env=_env(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            request = urllib.request.Request(
+                f"http://127.0.0.1:{port}/mcp",
+                data=body,
+                headers={"Content-Type": "application/json", "Accept": "application/json, text/event-stream"}
+            )
+            try:
+                with urllib.request.urlopen(request, timeout=1) as response:
+                    response.read()
+                    return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError("MCP server didn't answer `initialize` in time")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'module':<36} {'import':>10}   loaded")
+    for module, cwd in MODULES:
+        measured = measure_import(module, cwd, args.runs)
+        if measured is None:
+            print(f"{module:<36} {'failed':>10}")
+            continue
+        elapsed, loaded = measured
+        print(f"{module:<36} {elapsed * 1000:>7.1f} ms   {', '.join(loaded)}")
+
+    samples = [measure_first_initialize() for _ in range(args.runs)]
+    print(f"\nspawn -> first initialize response: median {statistics.median(samples) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
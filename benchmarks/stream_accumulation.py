@@ -0,0 +1,121 @@
+"""
+Microbenchmark of streamed delta accumulation in DialClient._stream_response.
+
+Reports chunks per second for the previous accumulation approach (`+=` and re-walk of all tool call deltas)
+vs StreamAccumulator, and for `_stream_response` with every output sink (console output goes to /dev/null).
+
+    python -m benchmarks.stream_accumulation
+    python -m benchmarks.stream_accumulation --recording session.jsonl
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import time
+from collections import defaultdict
+
+from openai.types.chat import ChatCompletionChunk
+
+from agent.clients.completion_backends import ReplayCompletionClient, load_recordings
+from agent.clients.dial_client import DialClient
+from agent.clients.output_sinks import BufferedConsoleSink, ConsoleSink, NullSink
+from agent.clients.stream_accumulator import StreamAccumulator
+from agent.models.message import Message, Role
+from benchmarks.fixtures import synthetic_completion
+
+
+def _legacy_accumulate(chunks) -> tuple[str, list]:
+    content = ""
+    tool_deltas = []
+    for chunk in chunks:
+        delta = chunk.choices[0].delta
+        if delta.content:
+            content += delta.content
+        if delta.tool_calls:
+            tool_deltas.extend(delta.tool_calls)
+
+    tool_dict = defaultdict(lambda: {"id": None, "function": {"arguments": "", "name": None}, "type": None})
+    for delta in tool_deltas:
+        idx = delta.index
+        if delta.id: tool_dict[idx]["id"] = delta.id
+        if delta.function.name: tool_dict[idx]["function"]["name"] = delta.function.name
+        if delta.function.arguments: tool_dict[idx]["function"]["arguments"] += delta.function.arguments
+        if delta.type: tool_dict[idx]["type"] = delta.type
+    return content, list(tool_dict.values())
+
+
+def _accumulate(chunks) -> tuple[str, list]:
+    accumulator = StreamAccumulator()
+    for chunk in chunks:
+        delta = chunk.choices[0].delta
+        if delta.content:
+            accumulator.add_content(delta.content)
+        if delta.tool_calls:
+            accumulator.add_tool_calls(delta.tool_calls)
+    return accumulator.content, accumulator.tool_calls
+
+
+def _report(name: str, chunks: int, elapsed: float) -> None:
+    print(f"{name:<40} {chunks / elapsed:>14,.0f} chunks/s")
+
+
+async def run(recordings: list[dict], iterations: int) -> None:
+    replay = ReplayCompletionClient(recordings, cycle=True)
+    streams = [[ChatCompletionChunk.model_validate(chunk) for chunk in r["chunks"]] for r in recordings]
+    total_chunks = sum(len(chunks) for chunks in streams) * iterations
+
+    assert _legacy_accumulate(streams[0]) == _accumulate(streams[0])
+
+    for name, accumulate in (("legacy accumulation", _legacy_accumulate), ("StreamAccumulator", _accumulate)):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            for chunks in streams:
+                accumulate(chunks)
+        _report(name, total_chunks, time.perf_counter() - started)
+
+    messages = [Message(role=Role.USER, content="benchmark")]
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        sinks = {
+            "_stream_response + ConsoleSink": ConsoleSink(),
+            "_stream_response + BufferedConsoleSink": BufferedConsoleSink(),
+            "_stream_response + NullSink": NullSink(),
+        }
+        results = []
+        for name, sink in sinks.items():
+            client = DialClient(
+                api_key="offline",
+                endpoint="http://offline",
+                tools=[],
+                tool_name_client_map={},
+                completion_client=replay,
+                output_sink=sink,
+            )
+            replay.reset()
+            started = time.perf_counter()
+            for _ in range(iterations * len(streams)):
+                await client._stream_response(messages)
+            results.append((name, time.perf_counter() - started))
+
+    for name, elapsed in results:
+        _report(name, total_chunks, elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recording", help="JSONL file recorded with RecordingCompletionClient")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.recording:
+        recordings = load_recordings(args.recording)
+    else:
+        recordings = [
+            synthetic_completion(content_tokens=2000),
+            synthetic_completion(content_tokens=50, tool_calls=3, argument_chunks=1000),
+        ]
+
+    asyncio.run(run(recordings, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Throughput scaling of MCP server from 1 to N worker processes (`uvicorn --workers`, sessions shared through
+`MCP_SESSION_STORE`): `tools/call search_users` with large results from a stub users service, requests per
+second and latency for every worker count, optionally with process pool for result formatting.
+
+    python -m benchmarks.throughput --max-workers 4 --process-pool 1
+
+Load is generated by this process, on machines with few cores it competes with the server for CPU.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.fixtures import synthetic_users
+from benchmarks.startup import ROOT, SERVER_DIR, _free_port
+
+HEADERS = {"Content-Type": "application/json", "Accept": "application/json, text/event-stream"}
+
+
+def _serve_users(port: int, users_count: int) -> None:
+    """Stub users service answering search with pre-encoded payload, so that it is never the bottleneck"""
+    from aiohttp import web
+
+    payload = json.dumps(synthetic_users(users_count)).encode("utf-8")
+
+    async def search(_: web.Request) -> web.Response:
+        return web.Response(body=payload, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/v1/users/search", search)
+    web.run_app(app, host="127.0.0.1", port=port, print=None)
+
+
+async def _start_session(http, url: str) -> str:
+    body = {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {"protocolVersion": "2024-11-05"}}
+    async with http.post(url, json=body, headers=HEADERS) as response:
+        await response.read()
+        session_id = response.headers["Mcp-Session-Id"]
+    async with http.post(url, json={"jsonrpc": "2.0", "method": "notifications/initialized"},
+                         headers={**HEADERS, "Mcp-Session-Id": session_id}) as response:
+        await response.read()
+    return session_id
+
+
+async def _load(url: str, sessions: int, concurrency: int, duration: float, arguments: dict) -> tuple[int, int, list[float]]:
+    import aiohttp
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=concurrency)) as http:
+        session_ids = [await _start_session(http, url) for _ in range(sessions)]
+        latencies, errors = [], 0
+        deadline = time.perf_counter() + duration
+
+        async def worker(i: int) -> None:
+            nonlocal errors
+            headers = {**HEADERS, "Mcp-Session-Id": session_ids[i % sessions]}
+            while time.perf_counter() < deadline:
+                body = {"jsonrpc": "2.0", "id": i, "method": "tools/call",
+                        "params": {"name": "search_users", "arguments": arguments}}
+                started = time.perf_counter()
+                async with http.post(url, json=body, headers=headers) as response:
+                    content = await response.read()
+                if response.status != 200 or b'"isError": true' in content:
+                    errors += 1
+                else:
+                    latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        return len(latencies), errors, latencies
+
+
+def _wait_ready(port: int, timeout: float = 30) -> None:
+    import urllib.request
+
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/stats", timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("MCP server didn't start in time")
+
+
+def measure(workers: int, users_port: int, args: argparse.Namespace) -> tuple[float, int, list[float]]:
+    port = _free_port()
+    store = os.path.join(tempfile.gettempdir(), f"mcp-bench-sessions-{os.getpid()}-{workers}.db")
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(ROOT), str(SERVER_DIR)]),
+        "USERS_MANAGEMENT_SERVICE_URL": f"http://127.0.0.1:{users_port}",
+        "MCP_SESSION_STORE": store,
+        "MCP_PROCESS_POOL_SIZE": str(args.process_pool),
+        # Server capacity is measured, not rate limiting
+        "MCP_SESSION_RATE": "1000000", "MCP_SESSION_BURST": "1000000",
+        "MCP_TOOL_RATE": "1000000", "MCP_TOOL_BURST": "1000000",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server:app", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning"],
+        cwd=SERVER_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        _wait_ready(port)
+        arguments = {"output_format": args.output_format}
+        completed, errors, latencies = asyncio.run(
+            _load(f"http://127.0.0.1:{port}/mcp", args.sessions, args.concurrency, args.duration, arguments)
+        )
+        return completed / args.duration, errors, latencies
+    finally:
+        process.terminate()
+        process.wait()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(store + suffix):
+                os.remove(store + suffix)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    parser.add_argument("--process-pool", type=int, default=0, help="Formatting processes per worker (0: inline)")
+    parser.add_argument("--users", type=int, default=1000, help="Users in every search result")
+    parser.add_argument("--output-format", default="markdown")
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=5)
+    args = parser.parse_args()
+
+    users_port = _free_port()
+    users_service = multiprocessing.Process(target=_serve_users, args=(users_port, args.users), daemon=True)
+    users_service.start()
+    try:
+        _wait_for_port(users_port)
+        print(f"{'workers':>7} {'req/s':>9} {'speedup':>8} {'p50':>9} {'p99':>9} {'errors':>7}")
+        baseline = None
+        for workers in range(1, args.max_workers + 1):
+            rps, errors, latencies = measure(workers, users_port, args)
+            baseline = baseline or rps
+            latencies.sort()
+            p50 = statistics.median(latencies) * 1000 if latencies else 0.0
+            p99 = latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0
+            print(f"{workers:>7} {rps:>9.1f} {rps / baseline if baseline else 0:>7.2f}x "
+                  f"{p50:>6.1f} ms {p99:>6.1f} ms {errors:>7}")
+    finally:
+        users_service.terminate()
+
+
+def _wait_for_port(port: int, timeout: float = 10) -> None:
+    import socket
+
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        with socket.socket() as sock:
+            if sock.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.05)
+    raise RuntimeError("Stub users service didn't start in time")
+
+
+if __name__ == "__main__":
+    main()
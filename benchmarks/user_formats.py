@@ -0,0 +1,41 @@
+"""
+Benchmark of user tool output formats: result size and formatting time of `search_users` results
+in markdown (default), compact JSON and columnar table formats, with all fields and with a field subset.
+Token count is estimated as characters / 4.
+
+    python -m benchmarks.user_formats
+"""
+import argparse
+import time
+
+from benchmarks.fixtures import synthetic_users
+from mcp_server.tools.users.user_formatter import OUTPUT_FORMATS, format_users
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--fields", nargs="+", default=["id", "name", "surname", "email"],
+                        help="Field subset to compare with full records")
+    args = parser.parse_args()
+
+    users = synthetic_users(args.users)
+    baseline = len(format_users(users))
+
+    print(f"{'format':>9} {'fields':>7} {'bytes':>10} {'~tokens':>9} {'vs md':>7} {'ms/format':>10}")
+    for fields in (None, args.fields):
+        for output_format in OUTPUT_FORMATS:
+            started = time.perf_counter()
+            for _ in range(args.iterations):
+                text = format_users(users, output_format, fields)
+            elapsed = (time.perf_counter() - started) / args.iterations * 1e3
+
+            size = len(text.encode("utf-8"))
+            label = "all" if fields is None else str(len(fields))
+            print(f"{output_format:>9} {label:>7} {size:>10} {len(text) // 4:>9} "
+                  f"{size / baseline:>7.2f} {elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
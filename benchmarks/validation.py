@@ -0,0 +1,72 @@
+"""
+Benchmark of tool argument validation cost per call with validators built at tool registration (pydantic-core).
+Tools with `arguments_model` are validated once, with their model; for them it is also compared with validating
+input schema first and then the model inside the tool, as validation used to be done.
+
+    python -m benchmarks.validation
+"""
+import argparse
+import time
+
+from mcp_server.services.validation import ArgumentsValidationError, compile_schema
+from mcp_server.tools.registry import ToolRegistry
+
+VALID_CREATE = {
+    "name": "Arkadiy",
+    "surname": "Dobkin",
+    "email": "arkadiy@example.com",
+    "phone": "+1-555-0000001",
+    "address": {"country": "USA", "city": "Newtown", "street": "Main St", "flat_house": "1"},
+    "salary": 100000.0,
+    "about_me": "Founder",
+    "credit_card": {"num": "4111-1111-1111-1111", "cvv": "123", "exp_date": "12/30"},
+}
+CASES = [
+    ("add_user", "valid", VALID_CREATE),
+    ("add_user", "invalid", {**VALID_CREATE, "address": {"country": "USA", "city": 5}}),
+    ("update_user", "valid", {"id": 1, "new_info": {"company": "EPAM", "salary": 120000.0}}),
+    ("update_user", "invalid", {"id": 1, "new_info": {"salary": "a lot"}}),
+    ("get_user_by_id", "valid", {"id": 1, "output_format": "table", "fields": ["id", "name"]}),
+    ("get_user_by_id", "invalid", {"id": 1, "output_format": "xml"}),
+    ("search_users", "valid", {"name": "Arkadiy", "gender": "male"}),
+    ("search_users", "invalid", {"name": "Arkadiy", "foo": 1}),
+]
+
+
+def _measure(validate, value, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        try:
+            validate(value)
+        except ArgumentsValidationError:
+            pass
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    registry = ToolRegistry(["mcp_server.tools.users"], compile_schema)
+
+    print(f"{'case':<24} {'validator':>12} {'schema + model':>16}")
+    for tool_name, kind, arguments in CASES:
+        entry = registry.get(tool_name)
+        validator_us = _measure(entry.validator, arguments, args.iterations)
+
+        model = entry.tool_cls.__new__(entry.tool_cls).arguments_model
+        twice = "-"
+        if model is not None:
+            schema_validator, model_validator = compile_schema(entry.mcp_tool["inputSchema"]), compile_schema(model)
+
+            def validate_twice(value):
+                schema_validator(value)
+                model_validator(value)
+
+            twice = f"{_measure(validate_twice, arguments, args.iterations):.2f} us"
+        print(f"{tool_name + ' ' + kind:<24} {validator_us:>9.2f} us {twice:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_CONTENT_TYPES = ("application/json", "text/event-stream", "text/plain")
+
+
+class GzipEncoder:
+    name = "gzip"
+    _wbits = 31
+
+    def __init__(self, level: int = 6) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, self._wbits)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress chunk and flush it, so that client can decode it without waiting for the next one"""
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class DeflateEncoder(GzipEncoder):
+    # HTTP `deflate` is zlib-wrapped deflate stream (RFC 9110)
+    name = "deflate"
+    _wbits = 15
+
+
+class ZstdEncoder:
+    name = "zstd"
+
+    def __init__(self, level: int = 3) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+class BrotliEncoder:
+    name = "br"
+
+    def __init__(self, level: int = 4) -> None:
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def available_encoders() -> dict[str, type]:
+    """Supported encoders in server preference order, zstd and br only when their packages are installed"""
+    encoders = {}
+    if zstandard is not None:
+        encoders[ZstdEncoder.name] = ZstdEncoder
+    if brotli is not None:
+        encoders[BrotliEncoder.name] = BrotliEncoder
+    encoders[GzipEncoder.name] = GzipEncoder
+    encoders[DeflateEncoder.name] = DeflateEncoder
+    return encoders
+
+
+def negotiate_encoding(accept_encoding: Optional[str], supported: list[str]) -> Optional[str]:
+    """Pick encoding with the highest q-value from Accept-Encoding, ties are resolved by `supported` order"""
+    if not accept_encoding:
+        return None
+
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().lower().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        if coding:
+            weights[coding.strip()] = weight
+
+    wildcard = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for coding in supported:
+        weight = weights.get(coding, wildcard)
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Negotiated response compression for JSON and SSE responses.
+
+    Responses smaller than `minimum_size` are sent as-is. For streaming responses the decision is made on the first
+    body chunk and every following chunk is flushed through the encoder, so SSE events still reach client promptly.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, encoders: Optional[dict[str, type]] = None) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoders = encoders or available_encoders()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"), list(self.encoders))
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressionResponder(self.app, self.encoders[encoding], self.minimum_size)(scope, receive, send)
+
+
+class _CompressionResponder:
+
+    def __init__(self, app: ASGIApp, encoder_cls: type, minimum_size: int) -> None:
+        self.app = app
+        self.encoder_cls = encoder_cls
+        self.minimum_size = minimum_size
+        self.send: Optional[Send] = None
+        self.initial_message: Optional[Message] = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self._send_with_compression)
+
+    async def _send_with_compression(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # Headers are held back until the first body chunk shows whether compression is worth it
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+            self.passthrough = "content-encoding" in headers or content_type not in COMPRESSIBLE_CONTENT_TYPES
+            if self.passthrough:
+                await self.send(message)
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.initial_message is not None:
+            initial_message, self.initial_message = self.initial_message, None
+            headers = MutableHeaders(raw=initial_message["headers"])
+            headers.add_vary_header("Accept-Encoding")
+
+            if len(body) < self.minimum_size:
+                self.passthrough = True
+                await self.send(initial_message)
+                await self.send(message)
+                return
+
+            self.encoder = self.encoder_cls()
+            headers["Content-Encoding"] = self.encoder.name
+            body = self.encoder.compress(body)
+            if not more_body:
+                body += self.encoder.finish()
+                headers["Content-Length"] = str(len(body))
+            elif "content-length" in headers:
+                del headers["Content-Length"]
+
+            await self.send(initial_message)
+            await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+
+        body = self.encoder.compress(body) if body else b""
+        if not more_body:
+            body += self.encoder.finish()
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class Address(BaseModel):
@@ -43,6 +43,12 @@ class UserUpdate(BaseModel):
     credit_card: Optional[UserCreate] = None
 
 
+class UserUpdateRequest(BaseModel):
+    # Strict, so that e.g. true or 2.9 is rejected instead of updating user 1 or 2
+    id: int = Field(strict=True, description="User ID that should be updated.")
+    new_info: UserUpdate = Field(default_factory=UserUpdate)
+
+
 class UserSearchRequest(BaseModel):
     name: Optional[str] = None
     email: Optional[str] = None
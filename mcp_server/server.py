@@ -1,94 +1,333 @@
+import asyncio
 import json
+import math
+import os
+import time
+from contextlib import asynccontextmanager
 from typing import Optional
-from fastapi import FastAPI, Response, Header
-from fastapi.responses import StreamingResponse
-import uvicorn
+from fastapi import Depends, FastAPI, Request, Response, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
-from mcp_server.services.mcp_server import MCPServer
+from mcp_server.middleware.compression import CompressionMiddleware
+from mcp_server.services.admission import AdmissionRejected
+from mcp_server.services.mcp_server import SESSION_TTL, MCPServer, MCPSession
+from mcp_server.services.profiling import LoopMonitor, RequestTimings, SamplingProfiler
 from models.request import MCPRequest
 from models.response import MCPResponse, ErrorResponse
 
 MCP_SESSION_ID_HEADER = "Mcp-Session-Id"
+# JSON-RPC implementation-defined server error, used for overload and rate limiting
+SERVER_BUSY_ERROR_CODE = -32000
+# Responses smaller than this (in bytes) are sent uncompressed
+COMPRESSION_MIN_SIZE = int(os.getenv("MCP_COMPRESSION_MIN_SIZE", "1024"))
+# Interval (seconds) of checking tool modules for changes, hot reload is disabled when 0
+TOOLS_RELOAD_INTERVAL = float(os.getenv("MCP_TOOLS_RELOAD_INTERVAL", "0"))
+# Create tools and their clients on startup instead of the first call (e.g. to prewarm users cache)
+TOOLS_WARM_UP = os.getenv("MCP_TOOLS_WARM_UP", "false").lower() == "true"
+# Event loop lag, blocked callbacks and slow requests monitoring, with /debug endpoints
+PROFILING = os.getenv("MCP_PROFILING", "false").lower() == "true"
+# Loop stalls (seconds) longer than this get stack sample of the blocking callback
+BLOCKED_LOOP_THRESHOLD = float(os.getenv("MCP_BLOCKED_LOOP_THRESHOLD", "0.1"))
+SLOW_REQUEST_THRESHOLD = float(os.getenv("MCP_SLOW_REQUEST_THRESHOLD", "1.0"))
+# Shorter sampling intervals would keep profiler thread busy and starve the event loop
+MIN_PROFILER_INTERVAL = 0.001
+# Request timings are kept only for these methods (and registered tools), everything else is counted together
+MCP_METHODS = {"initialize", "notifications/initialized", "notifications/cancelled", "tools/list", "tools/call"}
+UNKNOWN_OPERATION = "unknown"
+ADMISSION_EXEMPT_METHODS = {"notifications/initialized", "notifications/cancelled"}
+
+
+async def _reload_tools_periodically():
+    while True:
+        await asyncio.sleep(TOOLS_RELOAD_INTERVAL)
+        if reloaded := mcp_server.tool_registry.reload_changed():
+            print(f"Reloaded tool modules: {', '.join(reloaded)}")
+
+async def _prune_sessions_periodically():
+    while True:
+        await asyncio.sleep(SESSION_TTL / 4)
+        try:
+            await mcp_server.prune_sessions()
+        except Exception as e:
+            print(f"Failed to prune sessions: {e}")
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    if TOOLS_WARM_UP:
+        await mcp_server.tool_registry.warm_up()
+    reload_task = asyncio.create_task(_reload_tools_periodically()) if TOOLS_RELOAD_INTERVAL > 0 else None
+    prune_task = asyncio.create_task(_prune_sessions_periodically()) if SESSION_TTL > 0 else None
+    if loop_monitor:
+        loop_monitor.start()
+    yield
+    if reload_task:
+        reload_task.cancel()
+    if prune_task:
+        prune_task.cancel()
+    if loop_monitor:
+        loop_monitor.stop()
+    await mcp_server.close()
 
 # FastAPI app
-app = FastAPI(title="MCP Tools Server", version="1.0.0")
+app = FastAPI(title="MCP Tools Server", version="1.0.0", lifespan=lifespan)
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
 mcp_server = MCPServer()
+loop_monitor = LoopMonitor(BLOCKED_LOOP_THRESHOLD) if PROFILING else None
+request_timings = RequestTimings(SLOW_REQUEST_THRESHOLD) if PROFILING else None
+profiler = SamplingProfiler()
 
 
 def _validate_accept_header(accept_header: Optional[str]) -> bool:
     """Validate that client accepts both JSON and SSE"""
-    #TODO:
-    # 1. Check if `accept_header` is None or falsy, return False if so
-    # 2. Split `accept_header` by commas and create `accept_types` list with stripped and lowercased values
-    # 3. Check if any type in `accept_types` contains 'application/json' and assign to `has_json`
-    # 4. Check if any type in `accept_types` contains 'text/event-stream' and assign to `has_sse`
-    # 5. Return `has_json and has_sse`
-    raise NotImplementedError()
+    if not accept_header:
+        return False
+
+    accept_types = [accept_type.strip().lower() for accept_type in accept_header.split(",")]
+    has_json = any("application/json" in accept_type for accept_type in accept_types)
+    has_sse = any("text/event-stream" in accept_type for accept_type in accept_types)
+    return has_json and has_sse
 
 async def _create_sse_stream(messages: list):
     """Create Server-Sent Events stream for responses"""
-    #TODO:
-    # 1. Iterate through `messages` list
-    # 2. For each message, create `event_data` string in format: f"data: {json.dumps(message.dict(exclude_none=True))}\n\n"
-    # 3. Yield `event_data.encode('utf-8')`
-    # 4. After loop, yield final message: b"data: [DONE]\n\n" (indicator that the streaming is finished)
-    raise NotImplementedError()
+    for message in messages:
+        event_data = f"data: {json.dumps(message.model_dump(exclude_none=True))}\n\n"
+        yield event_data.encode('utf-8')
+
+    yield b"data: [DONE]\n\n"
+
+def _too_many_requests_response(request_id, rejection: AdmissionRejected) -> Response:
+    """Fast 429 response with retry hint both in header and in JSON-RPC error data"""
+    retry_after = max(1, math.ceil(rejection.retry_after))
+    error_response = MCPResponse(
+        id=request_id,
+        error=ErrorResponse(
+            code=SERVER_BUSY_ERROR_CODE,
+            message=rejection.message,
+            data={"retry_after": rejection.retry_after}
+        )
+    )
+    return Response(
+        status_code=429,
+        content=error_response.model_dump_json(),
+        media_type="application/json",
+        headers={"Retry-After": str(retry_after)}
+    )
+
+async def _wait_for_disconnect(http_request: Request) -> None:
+    """Request body is already read, so the next ASGI message can only be `http.disconnect`"""
+    while True:
+        message = await http_request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+async def _cancel_on_disconnect(http_request: Request, coro):
+    """Run `coro` and cancel it as soon as client disconnects. Returns None if client is gone"""
+    work = asyncio.ensure_future(coro)
+    disconnect = asyncio.ensure_future(_wait_for_disconnect(http_request))
+    try:
+        await asyncio.wait({work, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        disconnect.cancel()
+
+    if work.done():
+        return work.result()
+
+    work.cancel()
+    try:
+        await work
+    except asyncio.CancelledError:
+        pass
+    return None
 
 @app.post("/mcp")
 async def handle_mcp_request(
         request: MCPRequest,
         response: Response,
+        http_request: Request,
         accept: Optional[str] = Header(None),
         mcp_session_id: Optional[str] = Header(None, alias=MCP_SESSION_ID_HEADER)
 ):
     """Single MCP endpoint handling all JSON-RPC requests with proper session management"""
-    #TODO:
-    # 1. Validate Accept header:
-    #       - Call `_validate_accept_header(accept)`
-    #       - If False, create `error_response` with MCPResponse:
-    #           - id="server-error",
-    #           - error=ErrorResponse(code=-32600, message="Client must accept both application/json and text/event-stream")
-    #       - Return Response with:
-    #           - status_code=406,
-    #           - content=error_response.model_dump_json(),
-    #           - media_type="application/json"
-    # 2. Handle initialization (no session required):
-    #       - If `request.method == "initialize"`:
-    #           - Call `mcp_server.handle_initialize(request)` and assign to `mcp_response, session_id`
-    #           - If `session_id` exists, set `response.headers[MCP_SESSION_ID_HEADER] = session_id` and `mcp_session_id = session_id`
-    # 3. Handle other methods (session required):
-    #       - Else block for non-initialize methods:
-    #           - Validate `mcp_session_id` exists, if not create error_response with
-    #               MCPResponse(id="server-error", error=ErrorResponse(code=-32600, message="Missing session ID"))
-    #               and return Response with:
-    #                   - status_code=400
-    #                   - content=error_response.model_dump_json()
-    #                   - media_type="application/json"
-    #           - Get `session` from `mcp_server.get_session(mcp_session_id)`
-    #           - If no session, return Response with:
-    #               - status_code=400
-    #               - content="No valid session ID provided"
-    #           - Handle notifications/initialized: if `request.method == "notifications/initialized"` then set
-    #               - `session.ready_for_operation = True`
-    #               - then return Response with status_code=202 and headers={MCP_SESSION_ID_HEADER: session.session_id}
-    #           - Check if session is ready:
-    #               - if not `session.ready_for_operation`, then create error_response and return Response with status_code=400
-    #                   and MCPResponse(id="server-error", error=ErrorResponse(code=-32600, message="Missing session ID"))
-    #           - Handle tools/list: if `request.method == "tools/list"`, call `mcp_server.handle_tools_list(request)` and assign to `mcp_response`
-    #           - Handle tools/call: if `request.method == "tools/call"`, call `mcp_server.handle_tools_call(request)` and assign to `mcp_response`
-    #           - Handle unknown methods: else create `mcp_response` with MCPResponse(id=request.id, error=ErrorResponse(code=-32602, message=f"Method '{request.method}' not found"))
-    # 4. Return StreamingResponse:
-    #       - content=_create_sse_stream([mcp_response])
-    #       - media_type="text/event-stream"
-    #       - headers={"Cache-Control": "no-cache", "Connection": "keep-alive", MCP_SESSION_ID_HEADER: mcp_session_id}
-    raise NotImplementedError()
+    started = time.perf_counter()
+    try:
+        return await _admit_mcp_request(request, response, http_request, accept, mcp_session_id)
+    finally:
+        if request_timings:
+            request_timings.record(*_timed_operation(request), time.perf_counter() - started)
+
+async def _admit_mcp_request(
+        request: MCPRequest,
+        response: Response,
+        http_request: Request,
+        accept: Optional[str],
+        mcp_session_id: Optional[str]
+):
+    session = None
+    if mcp_session_id and request.method != "initialize":
+        session = await mcp_server.get_session(mcp_session_id)
+
+    # These notifications are cheap and must get through even under overload (e.g. cancellation of in-flight calls),
+    # any other method goes through rate limits and admission
+    if request.method in ADMISSION_EXEMPT_METHODS:
+        return await _handle_mcp_request(request, response, http_request, accept, mcp_session_id, session)
+
+    # Rate limits are checked before admission, so that over-limit sessions don't take slots of the shared wait queue
+    if session and session.ready_for_operation:
+        if retry_after := session.check_rate_limit(_registered_tool_name(request)):
+            mcp_server.stats["rate_limited"] += 1
+            return _too_many_requests_response(request.id, AdmissionRejected("Rate limit exceeded", retry_after))
+
+    try:
+        async with mcp_server.admission.admit():
+            return await _handle_mcp_request(request, response, http_request, accept, mcp_session_id, session)
+    except AdmissionRejected as rejection:
+        return _too_many_requests_response(request.id, rejection)
+
+@app.get("/stats")
+async def get_stats():
+    """Server counters: admission, rate limiting, sessions"""
+    return mcp_server.get_stats()
+
+def _require_profiling() -> None:
+    if not PROFILING:
+        raise HTTPException(status_code=404, detail="Profiling is disabled, set MCP_PROFILING=true")
+
+@app.get("/debug/health", dependencies=[Depends(_require_profiling)])
+async def get_health():
+    """Event loop lag, stacks of blocked callbacks, request durations by method and tool"""
+    return {"loop": loop_monitor.snapshot(), "requests": request_timings.snapshot(), "profiling": profiler.running}
+
+@app.post("/debug/profiler/start", dependencies=[Depends(_require_profiling)])
+async def start_profiler(interval: float = Query(0.005, ge=MIN_PROFILER_INTERVAL, le=1, allow_inf_nan=False)):
+    """Start sampling event loop thread every `interval` seconds"""
+    if profiler.running:
+        raise HTTPException(status_code=409, detail="Profiler is already running")
+    profiler.start(interval)
+    return {"started": True, "interval": interval}
+
+@app.post("/debug/profiler/stop", dependencies=[Depends(_require_profiling)])
+async def stop_profiler():
+    """Stop profiler and download collapsed stacks (speedscope, flamegraph.pl)"""
+    if not profiler.running:
+        raise HTTPException(status_code=409, detail="Profiler is not running")
+    return _profile_response(profiler.stop())
+
+@app.get("/debug/profiler", dependencies=[Depends(_require_profiling)])
+async def get_profile():
+    """Download collapsed stacks of the last (or still running) profiling session"""
+    return _profile_response(profiler.output())
+
+def _profile_response(output: str) -> Response:
+    return PlainTextResponse(output, headers={"Content-Disposition": 'attachment; filename="mcp-profile.folded"'})
+
+def _tool_name(request: MCPRequest) -> Optional[str]:
+    name = request.params.get("name") if request.method == "tools/call" and request.params else None
+    # Non-string name is rejected by tools/call handler
+    return name if isinstance(name, str) else None
+
+def _registered_tool_name(request: MCPRequest) -> Optional[str]:
+    """Tool name of tools/call, only if such tool exists, so that per-tool state can't grow with arbitrary names"""
+    name = _tool_name(request)
+    return name if name and mcp_server.tool_registry.get(name) else None
+
+def _timed_operation(request: MCPRequest) -> tuple[str, Optional[str]]:
+    """Method and tool name for request timings, unknown ones are counted together"""
+    if request.method not in MCP_METHODS:
+        return UNKNOWN_OPERATION, None
+    if request.method != "tools/call":
+        return request.method, None
+    return request.method, _registered_tool_name(request) or UNKNOWN_OPERATION
+
+async def _handle_mcp_request(
+        request: MCPRequest,
+        response: Response,
+        http_request: Request,
+        accept: Optional[str],
+        mcp_session_id: Optional[str],
+        session: Optional[MCPSession]
+):
+    if not _validate_accept_header(accept):
+        error_response = MCPResponse(
+            id="server-error",
+            error=ErrorResponse(code=-32600, message="Client must accept both application/json and text/event-stream")
+        )
+        return Response(status_code=406, content=error_response.model_dump_json(), media_type="application/json")
+
+    if request.method == "initialize":
+        mcp_response, session_id = await mcp_server.handle_initialize(request)
+        if session_id:
+            response.headers[MCP_SESSION_ID_HEADER] = session_id
+            mcp_session_id = session_id
+    else:
+        if not mcp_session_id:
+            error_response = MCPResponse(
+                id="server-error",
+                error=ErrorResponse(code=-32600, message="Missing session ID")
+            )
+            return Response(status_code=400, content=error_response.model_dump_json(), media_type="application/json")
+
+        if not session:
+            return Response(status_code=400, content="No valid session ID provided")
+
+        if request.method == "notifications/initialized":
+            await mcp_server.mark_ready(session)
+            return Response(status_code=202, headers={MCP_SESSION_ID_HEADER: session.session_id})
+
+        if request.method == "notifications/cancelled":
+            mcp_server.handle_cancelled(request, session)
+            return Response(status_code=202, headers={MCP_SESSION_ID_HEADER: session.session_id})
+
+        if not session.ready_for_operation:
+            error_response = MCPResponse(
+                id="server-error",
+                error=ErrorResponse(code=-32600, message="Missing session ID")
+            )
+            return Response(status_code=400, content=error_response.model_dump_json(), media_type="application/json")
+
+        if request.method == "tools/list":
+            mcp_response = mcp_server.handle_tools_list(request)
+        elif request.method == "tools/call":
+            mcp_response = await _cancel_on_disconnect(http_request, mcp_server.handle_tools_call(request, session))
+            if mcp_response is None:
+                # 499 (client closed request), response is never delivered
+                return Response(status_code=499)
+        else:
+            mcp_response = MCPResponse(
+                id=request.id,
+                error=ErrorResponse(code=-32602, message=f"Method '{request.method}' not found")
+            )
+
+    return StreamingResponse(
+        content=_create_sse_stream([mcp_response]),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "Connection": "keep-alive", MCP_SESSION_ID_HEADER: mcp_session_id}
+    )
 
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "server:app",
-        host="0.0.0.0",
-        port=8006,
-        reload=True,
-        log_level="debug"
-    )
\ No newline at end of file
+    import tempfile
+    import uvicorn
+
+    # Several worker processes accept connections on the same port, sessions are shared through SQLite file
+    workers = int(os.getenv("MCP_WORKERS", "1"))
+    temporary_store = None
+    if workers > 1 and not os.getenv("MCP_SESSION_STORE"):
+        temporary_store = os.path.join(tempfile.gettempdir(), f"mcp-sessions-{os.getpid()}.db")
+        os.environ["MCP_SESSION_STORE"] = temporary_store
+
+    try:
+        uvicorn.run(
+            "server:app",
+            host="0.0.0.0",
+            port=8006,
+            # Reload is not supported together with multiple workers
+            reload=workers == 1,
+            workers=workers,
+            log_level="debug"
+        )
+    finally:
+        # All workers are stopped by now
+        if temporary_store:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(temporary_store + suffix):
+                    os.remove(temporary_store + suffix)
\ No newline at end of file
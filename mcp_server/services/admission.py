@@ -0,0 +1,74 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+
+class AdmissionRejected(Exception):
+    """Raised when request can't be admitted, `retry_after` is a hint in seconds for the client"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.message = message
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Token bucket refilled with `rate` tokens per second up to `capacity` (burst size)"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def wait_time(self) -> float:
+        """Seconds until a token is available (0 if it is available now), nothing is taken"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def try_acquire(self) -> float:
+        """Take one token. Returns 0 on success, otherwise seconds until the next token is available"""
+        if retry_after := self.wait_time():
+            return retry_after
+        self.tokens -= 1
+        return 0.0
+
+
+class AdmissionController:
+    """
+    Global cap of concurrently processed requests with bounded wait queue.
+    When queue is full, or request waited longer than `queue_timeout`, it is rejected instead of piling up.
+    """
+
+    def __init__(self, max_in_flight: int, max_queue: int, queue_timeout: float):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.queued = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+
+    @asynccontextmanager
+    async def admit(self):
+        if self._semaphore.locked() and self.queued >= self.max_queue:
+            self.rejected += 1
+            raise AdmissionRejected("Server is overloaded, wait queue is full", retry_after=self.queue_timeout)
+
+        self.queued += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise AdmissionRejected("Server is overloaded, request timed out in wait queue", retry_after=self.queue_timeout)
+        finally:
+            self.queued -= 1
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
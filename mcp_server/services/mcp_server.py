@@ -1,14 +1,48 @@
+import math
+import os
 import uuid
 import asyncio
+from collections import Counter
 
 from mcp_server.models.request import MCPRequest
 from mcp_server.models.response import MCPResponse, ErrorResponse
-from mcp_server.tools.users.create_user_tool import CreateUserTool
-from mcp_server.tools.users.delete_user_tool import DeleteUserTool
-from mcp_server.tools.users.get_user_by_id_tool import GetUserByIdTool
-from mcp_server.tools.users.search_users_tool import SearchUsersTool
-from mcp_server.tools.users.update_user_tool import UpdateUserTool
-from mcp_server.tools.users.user_client import UserClient
+from mcp_server.services.admission import AdmissionController, TokenBucket
+from mcp_server.services.session_store import SharedSessionStore
+from mcp_server.services.validation import ArgumentsValidationError, compile_schema
+from mcp_server.tools.registry import ToolRegistry
+
+# Packages scanned for BaseTool subclasses, in addition to `mcp_server.tools` entry points
+TOOL_PACKAGES = [p.strip() for p in os.getenv("MCP_TOOL_PACKAGES", "mcp_server.tools.users").split(",") if p.strip()]
+MAX_IN_FLIGHT = int(os.getenv("MCP_MAX_IN_FLIGHT", "64"))
+MAX_QUEUE = int(os.getenv("MCP_MAX_QUEUE", "128"))
+QUEUE_TIMEOUT = float(os.getenv("MCP_QUEUE_TIMEOUT", "5"))
+SESSION_RATE = float(os.getenv("MCP_SESSION_RATE", "20"))
+SESSION_BURST = float(os.getenv("MCP_SESSION_BURST", "40"))
+TOOL_RATE = float(os.getenv("MCP_TOOL_RATE", "10"))
+TOOL_BURST = float(os.getenv("MCP_TOOL_BURST", "20"))
+# Upper bound for tool call duration, clients can ask for shorter one with `params._meta.timeout` (seconds)
+TOOL_CALL_TIMEOUT = float(os.getenv("MCP_TOOL_CALL_TIMEOUT", "60"))
+# SQLite file with sessions shared by worker processes, sessions are kept in memory of one process when not set
+SESSION_STORE = os.getenv("MCP_SESSION_STORE")
+# Sessions idle for this long (seconds) are removed, from memory and from the shared store, never when 0
+SESSION_TTL = float(os.getenv("MCP_SESSION_TTL", "3600"))
+
+REQUEST_TIMEOUT_ERROR_CODE = -32001
+REQUEST_CANCELLED_ERROR_CODE = -32800
+
+
+def _requested_timeout(meta) -> float | None:
+    """Tool call timeout from `params._meta`, capped with TOOL_CALL_TIMEOUT, None if it is invalid"""
+    if meta is None:
+        return TOOL_CALL_TIMEOUT
+    if not isinstance(meta, dict):
+        return None
+    timeout = meta.get("timeout")
+    if timeout is None:
+        return TOOL_CALL_TIMEOUT
+    if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or not 0 < timeout < math.inf:
+        return None
+    return min(timeout, TOOL_CALL_TIMEOUT)
 
 
 class MCPSession:
@@ -19,6 +53,28 @@ class MCPSession:
         self.ready_for_operation = False
         self.created_at = asyncio.get_event_loop().time()
         self.last_activity = self.created_at
+        # When activity was last written to the shared store, it is done at most every quarter of SESSION_TTL
+        self.stored_at = self.created_at
+        self.rate_limiter = TokenBucket(SESSION_RATE, SESSION_BURST)
+        self.tool_rate_limiters: dict[str, TokenBucket] = {}
+        # In-flight tool calls by JSON-RPC request id, to be able to cancel them
+        self.pending_calls: dict[str | int, asyncio.Task] = {}
+
+    def check_rate_limit(self, tool_name: str | None = None) -> float:
+        """Returns 0 if request is allowed, otherwise seconds to wait before retry"""
+        limiters = [self.rate_limiter]
+        if tool_name:
+            tool_limiter = self.tool_rate_limiters.get(tool_name)
+            if tool_limiter is None:
+                tool_limiter = self.tool_rate_limiters[tool_name] = TokenBucket(TOOL_RATE, TOOL_BURST)
+            limiters.append(tool_limiter)
+
+        # Tokens are taken only when every bucket has one, rejected request doesn't spend any of them
+        if retry_after := max(limiter.wait_time() for limiter in limiters):
+            return retry_after
+        for limiter in limiters:
+            limiter.try_acquire()
+        return 0.0
 
 
 class MCPServer:
@@ -32,16 +88,30 @@ class MCPServer:
 
         # Session management
         self.sessions: dict[str, MCPSession] = {}
-        self.tools = {}
-        self._register_tools()
+        # Rate limits and in-flight calls stay per process, only session existence and readiness are shared
+        self.session_store = SharedSessionStore(SESSION_STORE) if SESSION_STORE else None
+        # Tools are discovered lazily, on first tools/list or tools/call, and instantiated on first call
+        self.tool_registry = ToolRegistry(TOOL_PACKAGES, compile_schema)
 
-    def _register_tools(self):
-        """Register all available tools"""
-        #TODO:
-        # 1. Crate UserClient
-        # 2. Create list of tools: GetUserByIdTool, SearchUsersTool, CreateUserTool, UpdateUserTool, DeleteUserTool
-        # 3. Iterate trough list and add them to `self.tools` dict where key is tool name and value is tool itself
-        raise NotImplementedError()
+        # Admission control
+        self.admission = AdmissionController(MAX_IN_FLIGHT, MAX_QUEUE, QUEUE_TIMEOUT)
+        self.stats = Counter()
+
+    async def close(self) -> None:
+        """Release resources of tool clients"""
+        await self.tool_registry.close()
+        if self.session_store:
+            await self.session_store.close()
+
+    def get_stats(self) -> dict[str, int]:
+        """Server counters together with current admission state"""
+        return {
+            **self.stats,
+            "sessions": len(self.sessions),
+            "in_flight": self.admission.in_flight,
+            "queued": self.admission.queued,
+            "overload_rejected": self.admission.rejected,
+        }
 
     def _validate_protocol_version(self, client_version: str) -> str:
         """Validate and negotiate protocol version"""
@@ -50,60 +120,154 @@ class MCPServer:
             return client_version
         return self.protocol_version
 
-    def get_session(self, session_id: str) -> MCPSession | None:
+    async def get_session(self, session_id: str) -> MCPSession | None:
         """Get an existing session"""
         session = self.sessions.get(session_id)
+        now = asyncio.get_event_loop().time()
+        if self.session_store and (
+                session is None or not session.ready_for_operation
+                or (SESSION_TTL > 0 and now - session.stored_at >= SESSION_TTL / 4)
+        ):
+            # Session could be created or initialized by another worker, or expired in all of them
+            ready = await self.session_store.touch(session_id)
+            if ready is None:
+                self.sessions.pop(session_id, None)
+                return None
+            if session is None:
+                session = self.sessions[session_id] = MCPSession(session_id)
+            session.ready_for_operation = ready
+            session.stored_at = now
         if session:
-            session.last_activity = asyncio.get_event_loop().time()
+            session.last_activity = now
         return session
 
-    def handle_initialize(self, request: MCPRequest) -> tuple[MCPResponse, str]:
+    async def prune_sessions(self) -> None:
+        """Remove sessions idle for SESSION_TTL, sessions with in-flight tool calls are kept"""
+        expired_before = asyncio.get_event_loop().time() - SESSION_TTL
+        for session_id, session in list(self.sessions.items()):
+            if session.last_activity < expired_before and not session.pending_calls:
+                del self.sessions[session_id]
+        if self.session_store:
+            if deleted := await self.session_store.delete_expired(SESSION_TTL):
+                print(f"Deleted {deleted} expired sessions from shared store")
+
+    async def handle_initialize(self, request: MCPRequest) -> tuple[MCPResponse, str]:
         """Handle initialization request with session creation"""
-        #TODO:
-        # 1. Create and assign to new `session_id` session ID as `str(uuid.uuid4()).replace("-", "")`
-        # 2. Create MCPSession with `session_id` and assign to `session`
-        # 3. Handle protocol version and assign to `protocol_version` variable:
-        #       `request.params.get("protocolVersion") if request.params else self.protocol_version`
-        # 4. Create MCPResponse:
-        #       - id=request.id
-        #       - result={
-        #                 "protocolVersion": protocol_version,
-        #                 "capabilities": {
-        #                     "tools": {},
-        #                     "resources": {},
-        #                     "prompts": {}
-        #                 },
-        #                 "serverInfo": self.server_info
-        #             }
-        # 5. Return created MCP response and `session_id`
-        raise NotImplementedError()
+        session_id = str(uuid.uuid4()).replace("-", "")
+        session = MCPSession(session_id)
+        self.sessions[session_id] = session
+        if self.session_store:
+            await self.session_store.save(session_id, ready=False)
+
+        protocol_version = request.params.get("protocolVersion") if request.params else self.protocol_version
+        mcp_response = MCPResponse(
+            id=request.id,
+            result={
+                "protocolVersion": self._validate_protocol_version(protocol_version),
+                "capabilities": {
+                    "tools": {},
+                    "resources": {},
+                    "prompts": {}
+                },
+                "serverInfo": self.server_info
+            }
+        )
+        return mcp_response, session_id
+
+    async def mark_ready(self, session: MCPSession) -> None:
+        """Handle notifications/initialized: session accepts operations from now on, in every worker"""
+        session.ready_for_operation = True
+        if self.session_store:
+            await self.session_store.save(session.session_id, ready=True)
 
     def handle_tools_list(self, request: MCPRequest) -> MCPResponse:
         """Handle tools/list request"""
-        #TODO:
-        # 1. Create `tools_list` by iterating through `self.tools.values()` and calling `to_mcp_tool()` on each tool (via comprehension)
-        # 2. Create MCPResponse:
-        #       - id=request.id
-        #       - result={"tools": tools_list}
-        # 3. Return created MCP response
-
-    async def handle_tools_call(self, request: MCPRequest) -> MCPResponse:
+        tools_list = self.tool_registry.list_tools()
+        return MCPResponse(id=request.id, result={"tools": tools_list})
+
+    def handle_cancelled(self, request: MCPRequest, session: MCPSession) -> None:
+        """Handle notifications/cancelled: cancel in-flight tool call with given `requestId`"""
+        request_id = request.params.get("requestId") if request.params else None
+        task = session.pending_calls.get(request_id)
+        if task and not task.done():
+            task.cancel()
+
+    async def handle_tools_call(self, request: MCPRequest, session: MCPSession | None = None) -> MCPResponse:
         """Handle tools/call request with proper MCP-compliant response format"""
-        #TODO:
-        # 1. Check if `request.params` exists, if not return MCPResponse with error:
-        #       - id=request.id
-        #       - error=ErrorResponse(code=-32602, message="Missing parameters")
-        # 2. Extract `tool_name` from `request.params.get("name")` and `arguments` from `request.params.get("arguments", {})`
-        # 3. Check if `tool_name` exists, if not return MCPResponse with error:
-        #       - id=request.id
-        #       - error=ErrorResponse(code=-32602, message="Missing required parameter: name")
-        # 4. Check if `tool_name` exists in `self.tools`, if not return MCPResponse with error:
-        #       - id=request.id
-        #       - error=ErrorResponse(code=-32601, message=f"Tool '{tool_name}' not found")
-        # 5. Get `tool` from `self.tools[tool_name]`
-        # 6. Try to execute tool with arguments:
-        #       - Call `await tool.execute(arguments)` and assign result to `result_text`
-        #       - Return MCPResponse with id=request.id and result={"content": [{"type": "text", "text": result_text}]}
-        # 7. Handle exceptions by returning MCPResponse with:
-        #       - id=request.id
-        #       - result={"content": [{"type": "text", "text": f"Tool execution error: {str(tool_error)}"}], "isError": True}
+        if not request.params:
+            return MCPResponse(id=request.id, error=ErrorResponse(code=-32602, message="Missing parameters"))
+
+        tool_name = request.params.get("name")
+        arguments = request.params.get("arguments", {})
+
+        if not tool_name:
+            return MCPResponse(
+                id=request.id,
+                error=ErrorResponse(code=-32602, message="Missing required parameter: name")
+            )
+        if not isinstance(tool_name, str):
+            return MCPResponse(id=request.id, error=ErrorResponse(code=-32602, message="Parameter 'name' must be a string"))
+
+        tool_entry = self.tool_registry.get(tool_name)
+        if tool_entry is None:
+            return MCPResponse(id=request.id, error=ErrorResponse(code=-32601, message=f"Tool '{tool_name}' not found"))
+
+        # Invalid arguments are rejected here, before any upstream I/O; tool gets validated (converted) arguments
+        try:
+            arguments = tool_entry.validator(arguments)
+        except ArgumentsValidationError as e:
+            self.stats["invalid_arguments"] += 1
+            return MCPResponse(
+                id=request.id,
+                error=ErrorResponse(
+                    code=-32602,
+                    message=f"Invalid arguments for tool '{tool_name}': {e}",
+                    data={"path": e.path, "reason": e.message}
+                )
+            )
+
+        timeout = _requested_timeout(request.params.get("_meta"))
+        if timeout is None:
+            return MCPResponse(
+                id=request.id,
+                error=ErrorResponse(
+                    code=-32602,
+                    message="Parameter '_meta' must be an object, its 'timeout' a positive number of seconds"
+                )
+            )
+
+        tool = self.tool_registry.get_instance(tool_entry)
+
+        # Tool runs in its own task: cancelling it (notification, client disconnect, timeout) reaches the tool
+        # and aborts its upstream requests
+        task = asyncio.create_task(tool.execute(arguments))
+        if session and request.id is not None:
+            session.pending_calls[request.id] = task
+
+        try:
+            async with asyncio.timeout(timeout):
+                result_text = await task
+            return MCPResponse(id=request.id, result={"content": [{"type": "text", "text": result_text}]})
+        except TimeoutError:
+            self.stats["timed_out"] += 1
+            return MCPResponse(
+                id=request.id,
+                error=ErrorResponse(code=REQUEST_TIMEOUT_ERROR_CODE, message=f"Request timed out after {timeout}s")
+            )
+        except asyncio.CancelledError:
+            self.stats["cancelled"] += 1
+            if asyncio.current_task().cancelling():
+                # Whole request is cancelled (client disconnected), nobody is waiting for response
+                raise
+            return MCPResponse(
+                id=request.id,
+                error=ErrorResponse(code=REQUEST_CANCELLED_ERROR_CODE, message="Request cancelled")
+            )
+        except Exception as tool_error:
+            return MCPResponse(
+                id=request.id,
+                result={"content": [{"type": "text", "text": f"Tool execution error: {str(tool_error)}"}], "isError": True}
+            )
+        finally:
+            if session:
+                session.pending_calls.pop(request.id, None)
@@ -0,0 +1,89 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Optional
+
+# Worker processes for CPU-heavy post-processing of tool results, disabled (everything runs inline) when 0
+PROCESS_POOL_SIZE = int(os.getenv("MCP_PROCESS_POOL_SIZE", "0"))
+# Smaller payloads are processed inline, moving them to another process costs more than it saves
+PROCESS_POOL_MIN_SIZE = int(os.getenv("MCP_PROCESS_POOL_MIN_SIZE", str(64 * 1024)))
+
+# (payload, *args) -> result, must be a module level function to be callable in worker process
+PayloadFunction = Callable[..., bytes]
+
+
+class ProcessPool:
+    """
+    Runs CPU-heavy payload functions (parsing and formatting of large tool results) in worker processes.
+
+    Payload and result are passed through shared memory: only its name and size are pickled, so large
+    payloads are copied once into shared memory instead of being pickled and piped in chunks.
+    """
+
+    def __init__(self, size: int = PROCESS_POOL_SIZE, min_size: int = PROCESS_POOL_MIN_SIZE):
+        self.size = size
+        self.min_size = min_size
+        self.stats = {"inline": 0, "offloaded": 0}
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def run(self, func: PayloadFunction, payload: bytes, *args: Any) -> bytes:
+        if self.size <= 0 or len(payload) < self.min_size:
+            self.stats["inline"] += 1
+            return func(payload, *args)
+
+        if self._executor is None:
+            # Forking a process with running event loop and threads is unsafe
+            self._executor = ProcessPoolExecutor(self.size, mp_context=multiprocessing.get_context("spawn"))
+        self.stats["offloaded"] += 1
+
+        shared_payload = SharedMemory(create=True, size=max(len(payload), 1))
+        shared_payload.buf[:len(payload)] = payload
+        future = self._executor.submit(_run_on_shared_memory, func, shared_payload.name, len(payload), args)
+        # Payload is released only when worker is done with it, even if caller is cancelled meanwhile
+        future.add_done_callback(lambda _: _release(shared_payload))
+        try:
+            result_name, result_size = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.add_done_callback(_discard_result)
+            raise
+        return _take_result(result_name, result_size)
+
+    async def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _run_on_shared_memory(func: PayloadFunction, name: str, size: int, args: tuple) -> tuple[str, int]:
+    """Worker side: read payload from shared memory and put result into a new shared memory block"""
+    shared_payload = SharedMemory(name=name)
+    try:
+        payload = bytes(shared_payload.buf[:size])
+    finally:
+        shared_payload.close()
+
+    result = func(payload, *args)
+    shared_result = SharedMemory(create=True, size=max(len(result), 1))
+    shared_result.buf[:len(result)] = result
+    shared_result.close()
+    return shared_result.name, len(result)
+
+
+def _take_result(name: str, size: int) -> bytes:
+    shared_result = SharedMemory(name=name)
+    try:
+        return bytes(shared_result.buf[:size])
+    finally:
+        _release(shared_result)
+
+
+def _release(shared_memory: SharedMemory) -> None:
+    shared_memory.close()
+    shared_memory.unlink()
+
+
+def _discard_result(future: Future) -> None:
+    if not future.cancelled() and future.exception() is None:
+        _release(SharedMemory(name=future.result()[0]))
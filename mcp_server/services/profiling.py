@@ -0,0 +1,170 @@
+import asyncio
+import selectors
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from typing import Any, Optional
+
+
+class LoopMonitor:
+    """
+    Event loop health: lag of a periodic heartbeat and stacks of callbacks blocking the loop.
+
+    Heartbeat task sleeps `interval` and measures how late it wakes up. Watchdog thread checks the heartbeat and,
+    when the loop has not run it for longer than `block_threshold`, samples the stack of the loop thread, which
+    points to the blocking callback (sync I/O, large json.dumps, ...).
+    """
+
+    def __init__(self, block_threshold: float, interval: float = 0.05, history: int = 1000, max_blocked: int = 50):
+        self.block_threshold = block_threshold
+        self.interval = interval
+        self.lags: deque[float] = deque(maxlen=history)
+        self.max_lag = 0.0
+        self.blocked: deque[dict[str, Any]] = deque(maxlen=max_blocked)
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._beat())
+        threading.Thread(target=self._watch, name="loop-watchdog", daemon=True).start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def snapshot(self) -> dict[str, Any]:
+        lags = sorted(self.lags)
+        return {
+            "lag_ms": {
+                "mean": _ms(sum(lags) / len(lags)) if lags else 0.0,
+                "p99": _ms(lags[int(len(lags) * 0.99)]) if lags else 0.0,
+                "max": _ms(self.max_lag),
+            },
+            "blocked": list(self.blocked),
+        }
+
+    async def _beat(self) -> None:
+        while True:
+            self._heartbeat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - self._heartbeat - self.interval)
+            self.lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+    def _watch(self) -> None:
+        sampled_heartbeat = None
+        while not self._stopped.wait(self.block_threshold / 2):
+            heartbeat = self._heartbeat
+            blocked_for = time.monotonic() - heartbeat - self.interval
+            # One sample per stall, taken while the blocking callback is still running
+            if blocked_for < self.block_threshold or heartbeat == sampled_heartbeat:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            # Loop waiting in select is idle, heartbeat is just about to run
+            if frame is None or frame.f_code.co_filename == selectors.__file__:
+                continue
+            sampled_heartbeat = heartbeat
+            self.blocked.append({
+                "at": time.time(),
+                "blocked_ms": _ms(blocked_for),
+                "stack": traceback.format_stack(frame),
+            })
+
+
+class RequestTimings:
+    """Durations of /mcp requests by JSON-RPC method and tool name, with log of the slowest ones"""
+
+    def __init__(self, slow_threshold: float, max_slow: int = 100):
+        self.slow_threshold = slow_threshold
+        self.by_operation: dict[str, dict[str, float]] = {}
+        self.slow: deque[dict[str, Any]] = deque(maxlen=max_slow)
+
+    def record(self, method: str, tool_name: Optional[str], duration: float) -> None:
+        operation = f"{method}:{tool_name}" if tool_name else method
+        timing = self.by_operation.get(operation)
+        if timing is None:
+            timing = self.by_operation[operation] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "slow": 0}
+        timing["count"] += 1
+        timing["total_ms"] += duration * 1000
+        timing["max_ms"] = max(timing["max_ms"], duration * 1000)
+        if duration >= self.slow_threshold:
+            timing["slow"] += 1
+            self.slow.append({"at": time.time(), "method": method, "tool": tool_name, "duration_ms": _ms(duration)})
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "by_operation": {
+                operation: {
+                    "count": timing["count"],
+                    "slow": timing["slow"],
+                    "mean_ms": round(timing["total_ms"] / timing["count"], 3),
+                    "max_ms": round(timing["max_ms"], 3),
+                }
+                for operation, timing in self.by_operation.items()
+            },
+            "slow": list(self.slow),
+        }
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler of the event loop thread. Output is in collapsed stacks format
+    (`frame;frame;frame count` per line), readable by speedscope and flamegraph.pl.
+    """
+
+    def __init__(self):
+        self.samples: Counter[str] = Counter()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, interval: float) -> None:
+        if self.running:
+            raise RuntimeError("Profiler is already running")
+        self.samples = Counter()
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._sample, args=(threading.get_ident(), interval), name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> str:
+        if not self.running:
+            raise RuntimeError("Profiler is not running")
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+        return self.output()
+
+    def output(self) -> str:
+        # Copied in one step, sampling thread may still be adding stacks
+        samples = dict(self.samples)
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(samples.items(), key=lambda item: -item[1]))
+
+    def _sample(self, thread_id: int, interval: float) -> None:
+        while not self._stopped.wait(interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
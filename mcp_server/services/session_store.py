@@ -0,0 +1,59 @@
+import asyncio
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class SharedSessionStore:
+    """
+    Session state shared by server worker processes, kept in SQLite file (WAL mode, safe for concurrent writers).
+    Only what another worker needs to accept the session is stored: its id, whether it is initialized and when
+    it was last used. Queries run in a dedicated thread, waiting for a lock held by another worker doesn't block
+    the event loop.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions "
+            "(session_id TEXT PRIMARY KEY, ready INTEGER NOT NULL, created_at REAL, last_activity REAL)"
+        )
+        # One thread, so that the connection is never used concurrently
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-store")
+
+    async def save(self, session_id: str, ready: bool) -> None:
+        now = time.time()
+        await self._run(
+            "INSERT INTO sessions (session_id, ready, created_at, last_activity) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(session_id) DO UPDATE SET ready = excluded.ready, last_activity = excluded.last_activity",
+            (session_id, int(ready), now, now)
+        )
+
+    async def touch(self, session_id: str) -> Optional[bool]:
+        """Mark session as active, returns its `ready` flag, None if session is unknown (or expired)"""
+        row = await self._run(
+            "UPDATE sessions SET last_activity = ? WHERE session_id = ? RETURNING ready", (time.time(), session_id)
+        )
+        return None if row is None else bool(row[0])
+
+    async def delete_expired(self, max_idle: float) -> int:
+        """Delete sessions not used by any worker for `max_idle` seconds, returns number of deleted ones"""
+        return await self._run_in_thread(
+            lambda: self._db.execute("DELETE FROM sessions WHERE last_activity < ?", (time.time() - max_idle,)).rowcount
+        )
+
+    async def close(self) -> None:
+        await self._run_in_thread(self._db.close)
+        self._executor.shutdown()
+
+    async def _run(self, sql: str, parameters: tuple) -> Optional[tuple]:
+        """First row of the result; rows are fetched till the end, so that statement completes and is committed"""
+        rows = await self._run_in_thread(lambda: self._db.execute(sql, parameters).fetchall())
+        return rows[0] if rows else None
+
+    async def _run_in_thread(self, query: Callable[[], Any]) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, query)
@@ -0,0 +1,133 @@
+from typing import Annotated, Any, Callable, Literal, Union
+
+from pydantic import BaseModel, ConfigDict, Field, StrictBool, StrictFloat, StrictInt, TypeAdapter, ValidationError
+from typing_extensions import NotRequired, TypedDict
+
+# Returns validated arguments, raises ArgumentsValidationError
+Validator = Callable[[Any], Any]
+
+_PRIMITIVE_TYPES: dict[str, Any] = {
+    "string": str,
+    # Strict: booleans, numeric strings and fractional integers are rejected, not converted (e.g. true to user id 1)
+    "number": Union[StrictInt, StrictFloat],
+    "integer": StrictInt,
+    "boolean": StrictBool,
+    "null": None,
+}
+_IN_PROGRESS = object()
+
+
+class ArgumentsValidationError(Exception):
+    """Raised when tool arguments don't match tool input schema, `path` points to invalid value"""
+
+    def __init__(self, message: str, path: str = "arguments"):
+        super().__init__(message)
+        self.message = message
+        self.path = path
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.message}"
+
+
+def compile_schema(schema: dict[str, Any] | type[BaseModel]) -> Validator:
+    """
+    Build pydantic-core validator of tool arguments, once, at tool registration. Tools declaring `arguments_model`
+    are validated with that model, JSON Schema of other tools is translated into TypedDict types.
+    Schema numbers, integers and booleans are strict, models validate as they are defined (e.g. "100" is accepted
+    and converted for UserCreate salary).
+    Supported keywords: type, enum, const, properties, required, additionalProperties, items, anyOf, oneOf,
+    $ref (local, not recursive), min/max length, minimum/maximum; other keywords are ignored.
+    """
+    if isinstance(schema, type) and issubclass(schema, BaseModel):
+        validate = schema.model_validate
+    else:
+        validate = TypeAdapter(_TypeBuilder(schema).build(schema)).validate_python
+
+    def validate_arguments(arguments: Any) -> Any:
+        try:
+            return validate(arguments)
+        except ValidationError as e:
+            raise _to_arguments_error(e, arguments) from None
+
+    return validate_arguments
+
+
+class _TypeBuilder:
+    """Translates JSON Schema into Python type annotations understood by pydantic"""
+
+    def __init__(self, root: dict[str, Any]):
+        self.root = root
+        self._refs: dict[str, Any] = {}
+
+    def build(self, schema: dict[str, Any] | bool) -> Any:
+        if schema is True or schema == {}:
+            return Any
+
+        if "$ref" in schema:
+            result = self._build_ref(schema["$ref"])
+        elif "enum" in schema:
+            result = Literal[tuple(schema["enum"])]
+        elif "const" in schema:
+            result = Literal[schema["const"]]
+        elif "anyOf" in schema or "oneOf" in schema:
+            result = Union[tuple(self.build(sub_schema) for sub_schema in schema.get("anyOf") or schema["oneOf"])]
+        elif isinstance(schema.get("type"), list):
+            result = Union[tuple(self.build({**schema, "type": t}) for t in schema["type"])]
+        elif schema.get("type") == "object" or "properties" in schema:
+            result = self._build_object(schema)
+        elif schema.get("type") == "array":
+            result = list[self.build(schema.get("items", True))]
+        else:
+            result = _PRIMITIVE_TYPES.get(schema.get("type"), Any)
+
+        constraints = {
+            field: schema[keyword]
+            for keyword, field in (("minLength", "min_length"), ("maxLength", "max_length"),
+                                   ("minimum", "ge"), ("maximum", "le"))
+            if keyword in schema
+        }
+        return Annotated[result, Field(**constraints)] if constraints else result
+
+    def _build_ref(self, ref: str) -> Any:
+        if not ref.startswith("#/"):
+            raise ValueError(f"Only local $ref is supported, got '{ref}'")
+        if ref not in self._refs:
+            self._refs[ref] = _IN_PROGRESS
+            target = self.root
+            for part in ref[2:].split("/"):
+                target = target[part.replace("~1", "/").replace("~0", "~")]
+            self._refs[ref] = self.build(target)
+        if self._refs[ref] is _IN_PROGRESS:
+            raise ValueError(f"Recursive $ref is not supported, got '{ref}'")
+        return self._refs[ref]
+
+    def _build_object(self, schema: dict[str, Any]) -> Any:
+        properties = schema.get("properties")
+        additional = schema.get("additionalProperties", True)
+        if not properties and additional is not False:
+            return dict[str, self.build(additional)]
+
+        required = set(schema.get("required", ()))
+        fields = {
+            name: self.build(sub_schema) if name in required else NotRequired[self.build(sub_schema)]
+            for name, sub_schema in (properties or {}).items()
+        }
+        typed_dict = TypedDict(schema.get("title", "Arguments"), fields)
+        # Unknown properties are passed to the tool as they are, unless schema forbids them
+        typed_dict.__pydantic_config__ = ConfigDict(extra="forbid" if additional is False else "allow")
+        return typed_dict
+
+
+def _to_arguments_error(error: ValidationError, arguments: Any) -> ArgumentsValidationError:
+    """First error of pydantic, with location translated into path within arguments"""
+    first = error.errors(include_url=False)[0]
+    path, value = "arguments", arguments
+    # Location also contains names of union members and model classes, only keys and indexes of actual input are kept
+    for i, part in enumerate(first["loc"]):
+        if isinstance(value, dict) and part in value:
+            path, value = f"{path}.{part}", value[part]
+        elif isinstance(value, list) and isinstance(part, int) and part < len(value):
+            path, value = f"{path}[{part}]", value[part]
+        elif i == len(first["loc"]) - 1 and first["type"] == "missing":
+            path += f".{part}"
+    return ArgumentsValidationError(first["msg"], path)
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
 
 
 class BaseTool(ABC):
@@ -22,13 +24,20 @@ class BaseTool(ABC):
     def input_schema(self) -> Dict[str, Any]:
         pass
 
+    @property
+    def arguments_model(self) -> Optional[type[BaseModel]]:
+        """Pydantic model of arguments, if tool has one, it is used for validation instead of input schema"""
+        return None
+
     @abstractmethod
     async def execute(self, arguments: Dict[str, Any]) -> str:
         """Execute the tool with MCP-compliant arguments
 
         Args:
             arguments: Dictionary containing the tool arguments as passed
-                      by the MCP client (extracted from params.arguments)
+                      by the MCP client (extracted from params.arguments),
+                      already validated against input schema; instance of
+                      `arguments_model` for tools declaring it
 
         Returns:
             str: Tool execution result that will be wrapped in MCP content format
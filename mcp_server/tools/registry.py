@@ -0,0 +1,164 @@
+import importlib
+import inspect
+import os
+import pkgutil
+import sys
+import typing
+from importlib.metadata import entry_points
+from types import ModuleType
+from typing import Any, Callable, Optional
+
+from pydantic import BaseModel
+
+from mcp_server.tools.base import BaseTool
+
+ENTRY_POINT_GROUP = "mcp_server.tools"
+
+
+class ToolEntry:
+    """
+    Registered tool class. Metadata (name, description, schema) is read without calling tool constructor,
+    tool instance with its dependencies is created on the first call.
+    """
+
+    def __init__(self, tool_cls: type[BaseTool], compile_validator: Callable[[dict[str, Any] | type[BaseModel]], Any]):
+        self.tool_cls = tool_cls
+        self.module_name = tool_cls.__module__
+        # Metadata properties of tools must not depend on constructor state
+        metadata = tool_cls.__new__(tool_cls)
+        self.name = metadata.name
+        self.mcp_tool = metadata.to_mcp_tool()
+        self.validator = compile_validator(metadata.arguments_model or metadata.input_schema)
+        self.instance: Optional[BaseTool] = None
+
+
+class ToolRegistry:
+    """
+    Discovers BaseTool subclasses from entry points (group `mcp_server.tools`) and configured packages.
+
+    Nothing is imported until tools are first needed. Tool constructor dependencies are resolved by type
+    annotation (e.g. `user_client: UserClient`): one shared instance per type, created when the first tool
+    that needs it is called. Dependencies get their own constructor dependencies the same way.
+    Modules of registered tools can be reloaded on change without server restart.
+    """
+
+    def __init__(self, packages: list[str], compile_validator: Callable[[dict[str, Any] | type[BaseModel]], Any]):
+        self.packages = packages
+        self.compile_validator = compile_validator
+        self._entries: Optional[dict[str, ToolEntry]] = None
+        self._dependencies: dict[type, Any] = {}
+        self._module_mtimes: dict[str, float] = {}
+
+    @property
+    def entries(self) -> dict[str, ToolEntry]:
+        if self._entries is None:
+            self._entries = {}
+            for module in self._discover_modules():
+                self._register_module(module)
+        return self._entries
+
+    def get(self, tool_name: str) -> Optional[ToolEntry]:
+        return self.entries.get(tool_name)
+
+    def list_tools(self) -> list[dict[str, Any]]:
+        return [entry.mcp_tool for entry in self.entries.values()]
+
+    def get_instance(self, entry: ToolEntry) -> BaseTool:
+        if entry.instance is None:
+            entry.instance = entry.tool_cls(**self._resolve_dependencies(entry.tool_cls.__init__))
+        return entry.instance
+
+    def reload_changed(self) -> list[str]:
+        """Reload modules of registered tools which changed on disk, returns names of reloaded modules"""
+        if self._entries is None:
+            return []
+
+        reloaded = []
+        for module_name, mtime in list(self._module_mtimes.items()):
+            module = sys.modules.get(module_name)
+            if module is None or _module_mtime(module) == mtime:
+                continue
+
+            try:
+                module = importlib.reload(module)
+            except Exception as e:
+                # Broken module keeps serving previous tool versions until it is fixed
+                print(f"Failed to reload tool module {module_name}: {e}")
+                self._module_mtimes[module_name] = _module_mtime(module)
+                continue
+
+            # In-flight calls keep old instances, next calls get tools from reloaded module
+            for name in [name for name, entry in self._entries.items() if entry.module_name == module_name]:
+                del self._entries[name]
+            self._register_module(module)
+            self._module_mtimes[module_name] = _module_mtime(module)
+            reloaded.append(module_name)
+        return reloaded
+
+    async def warm_up(self) -> None:
+        """Create all tools with their dependencies ahead of the first call and let dependencies warm up (caches)"""
+        for entry in list(self.entries.values()):
+            self.get_instance(entry)
+        for dependency in list(self._dependencies.values()):
+            if warm_up := getattr(dependency, "warm_up", None):
+                await warm_up()
+
+    async def close(self) -> None:
+        """Release resources of created dependencies (clients), dependents are closed before their dependencies"""
+        for dependency in reversed(list(self._dependencies.values())):
+            if close := getattr(dependency, "close", None):
+                await close()
+        self._dependencies.clear()
+
+    def _discover_modules(self) -> list[ModuleType]:
+        modules = []
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            loaded = entry_point.load()
+            modules.append(loaded if isinstance(loaded, ModuleType) else sys.modules[loaded.__module__])
+
+        for package_name in self.packages:
+            package = importlib.import_module(package_name)
+            for module_info in pkgutil.iter_modules(package.__path__, prefix=f"{package_name}."):
+                modules.append(importlib.import_module(module_info.name))
+        return modules
+
+    def _register_module(self, module: ModuleType) -> None:
+        has_tools = False
+        for _, tool_cls in inspect.getmembers(module, inspect.isclass):
+            # Only classes defined in this module, imported base classes and tools are skipped
+            if tool_cls.__module__ != module.__name__ or not issubclass(tool_cls, BaseTool):
+                continue
+            if inspect.isabstract(tool_cls):
+                continue
+
+            entry = ToolEntry(tool_cls, self.compile_validator)
+            self._entries[entry.name] = entry
+            has_tools = True
+
+        # Only modules with tools are watched, shared clients and base classes are never reloaded
+        if has_tools:
+            self._module_mtimes[module.__name__] = _module_mtime(module)
+
+    def _resolve_dependencies(self, init: Callable[..., None]) -> dict[str, Any]:
+        hints = typing.get_type_hints(init)
+        kwargs = {}
+        for param_name, param in inspect.signature(init).parameters.items():
+            if param_name == "self" or param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+                continue
+            # Parameters with defaults are settings, not dependencies
+            if param.default is not param.empty:
+                continue
+            dependency_type = hints.get(param_name)
+            if dependency_type is None:
+                raise TypeError(f"Can't resolve '{param_name}' of {init.__qualname__}: type annotation is missing")
+            if dependency_type not in self._dependencies:
+                # Inserted after its own dependencies, so that close() can go in reverse order
+                instance = dependency_type(**self._resolve_dependencies(dependency_type.__init__))
+                self._dependencies[dependency_type] = instance
+            kwargs[param_name] = self._dependencies[dependency_type]
+        return kwargs
+
+
+def _module_mtime(module: ModuleType) -> float:
+    module_file = getattr(module, "__file__", None)
+    return os.path.getmtime(module_file) if module_file else 0.0
@@ -2,6 +2,7 @@ from abc import ABC
 
 from mcp_server.tools.base import BaseTool
 from mcp_server.tools.users.user_client import UserClient
+from mcp_server.tools.users.user_write_pipeline import UserWritePipeline
 
 
 class BaseUserServiceTool(BaseTool, ABC):
@@ -9,3 +10,11 @@ class BaseUserServiceTool(BaseTool, ABC):
     def __init__(self, user_client: UserClient):
         super().__init__()
         self._user_client = user_client
+
+
+class BaseUserWriteTool(BaseUserServiceTool, ABC):
+    """Tools changing users, writes go through shared UserWritePipeline"""
+
+    def __init__(self, user_client: UserClient, user_writes: UserWritePipeline):
+        super().__init__(user_client)
+        self._user_writes = user_writes
@@ -1,28 +1,27 @@
 from typing import Any
 
 from mcp_server.models.user_info import UserCreate
-from mcp_server.tools.users.base import BaseUserServiceTool
+from mcp_server.tools.users.base import BaseUserWriteTool
 
 
-class CreateUserTool(BaseUserServiceTool):
+class CreateUserTool(BaseUserWriteTool):
 
     @property
     def name(self) -> str:
-        #TODO: Provide tool name as `add_user`
-        raise NotImplementedError()
+        return "add_user"
 
     @property
     def description(self) -> str:
-        #TODO: Provide description of this tool
-        raise NotImplementedError()
+        return "Adds new user into the system"
 
     @property
     def input_schema(self) -> dict[str, Any]:
-        #TODO: Provide tool params Schema. To do that you can create json schema from UserCreate pydentic model ` UserCreate.model_json_schema()`
-        raise NotImplementedError()
-
-    async def execute(self, arguments: dict[str, Any]) -> str:
-        #TODO:
-        # 1. Validate arguments with `UserCreate.model_validate`
-        # 2. Call user_client add user and return its results (it is async, don't forget to await)
-        raise NotImplementedError()
\ No newline at end of file
+        return UserCreate.model_json_schema()
+
+    @property
+    def arguments_model(self) -> type[UserCreate]:
+        return UserCreate
+
+    async def execute(self, arguments: UserCreate) -> str:
+        applied = await self._user_writes.add_user(arguments)
+        return await applied
\ No newline at end of file
@@ -1,28 +1,33 @@
 from typing import Any
 
-from mcp_server.tools.users.base import BaseUserServiceTool
+from mcp_server.tools.users.base import BaseUserWriteTool
 
 
-class DeleteUserTool(BaseUserServiceTool):
+class DeleteUserTool(BaseUserWriteTool):
 
     @property
     def name(self) -> str:
-        #TODO: Provide tool name as `delete_users`
-        raise NotImplementedError()
+        return "delete_users"
 
     @property
     def description(self) -> str:
-        #TODO: Provide description of this tool
-        raise NotImplementedError()
+        return "Deletes user by user ID"
 
     @property
     def input_schema(self) -> dict[str, Any]:
-        #TODO:
-        # Provide tool params Schema. This tool applies user `id` (number) as a parameter and it is required
-        raise NotImplementedError()
+        return {
+            "type": "object",
+            "properties": {
+                "id": {
+                    "type": "integer",
+                    "description": "User ID"
+                }
+            },
+            "required": ["id"],
+            "additionalProperties": False
+        }
 
     async def execute(self, arguments: dict[str, Any]) -> str:
-        #TODO:
-        # 1. Get int `id` from arguments
-        # 2. Call user_client delete_user and return its results (it is async, don't forget to await)
-        raise NotImplementedError()
\ No newline at end of file
+        user_id = arguments["id"]
+        applied = await self._user_writes.delete_user(user_id)
+        return await applied
\ No newline at end of file
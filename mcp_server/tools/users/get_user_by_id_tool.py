@@ -1,28 +1,39 @@
 from typing import Any
 
 from mcp_server.tools.users.base import BaseUserServiceTool
+from mcp_server.tools.users.user_formatter import FIELDS_SCHEMA, MARKDOWN_FORMAT, OUTPUT_FORMAT_SCHEMA
 
 
 class GetUserByIdTool(BaseUserServiceTool):
 
     @property
     def name(self) -> str:
-        #TODO: Provide tool name as `get_user_by_id`
-        raise NotImplementedError()
+        return "get_user_by_id"
 
     @property
     def description(self) -> str:
-        #TODO: Provide description of this tool
-        raise NotImplementedError()
+        return "Provides full user information by user ID"
 
     @property
     def input_schema(self) -> dict[str, Any]:
-        #TODO:
-        # Provide tool params Schema. This tool applies user `id` (number) as a parameter and it is required
-        raise NotImplementedError()
+        return {
+            "type": "object",
+            "properties": {
+                "id": {
+                    "type": "integer",
+                    "description": "User ID"
+                },
+                "output_format": OUTPUT_FORMAT_SCHEMA,
+                "fields": FIELDS_SCHEMA
+            },
+            "required": ["id"],
+            "additionalProperties": False
+        }
 
     async def execute(self, arguments: dict[str, Any]) -> str:
-        #TODO:
-        # 1. Get int `id` from arguments
-        # 2. Call user_client get_user and return its results (it is async, don't forget to await)
-        raise NotImplementedError()
\ No newline at end of file
+        user_id = arguments["id"]
+        return await self._user_client.get_user(
+            user_id,
+            output_format=arguments.get("output_format", MARKDOWN_FORMAT),
+            fields=arguments.get("fields"),
+        )
\ No newline at end of file
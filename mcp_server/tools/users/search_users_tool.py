@@ -1,32 +1,46 @@
 from typing import Any
 
 from mcp_server.tools.users.base import BaseUserServiceTool
+from mcp_server.tools.users.user_formatter import FIELDS_SCHEMA, OUTPUT_FORMAT_SCHEMA
 
 
 class SearchUsersTool(BaseUserServiceTool):
 
     @property
     def name(self) -> str:
-        #TODO: Provide tool name as `search_users`
-        raise NotImplementedError()
+        return "search_users"
 
     @property
     def description(self) -> str:
-        #TODO: Provide description of this tool
-        raise NotImplementedError()
+        return "Searches users by name, surname, email and gender. All parameters are optional and can be combined"
 
     @property
     def input_schema(self) -> dict[str, Any]:
-        #TODO:
-        # Provide tool params Schema:
-        # - name: str
-        # - surname: str
-        # - email: str
-        # - gender: str
-        # None of them are required (see UserClient.search_users method)
-        raise NotImplementedError()
+        return {
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "User name"
+                },
+                "surname": {
+                    "type": "string",
+                    "description": "User surname"
+                },
+                "email": {
+                    "type": "string",
+                    "description": "User email"
+                },
+                "gender": {
+                    "type": "string",
+                    "description": "User gender"
+                },
+                "output_format": OUTPUT_FORMAT_SCHEMA,
+                "fields": FIELDS_SCHEMA
+            },
+            "required": [],
+            "additionalProperties": False
+        }
 
     async def execute(self, arguments: dict[str, Any]) -> str:
-        #TODO:
-        # Call user_client search_users (with `**arguments`) and return its results (it is async, don't forget to await)
-        raise NotImplementedError()
\ No newline at end of file
+        return await self._user_client.search_users(**arguments)
\ No newline at end of file
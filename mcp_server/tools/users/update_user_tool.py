@@ -1,33 +1,27 @@
 from typing import Any
 
-from mcp_server.models.user_info import UserUpdate
-from mcp_server.tools.users.base import BaseUserServiceTool
+from mcp_server.models.user_info import UserUpdateRequest
+from mcp_server.tools.users.base import BaseUserWriteTool
 
 
-class UpdateUserTool(BaseUserServiceTool):
+class UpdateUserTool(BaseUserWriteTool):
 
     @property
     def name(self) -> str:
-        #TODO: Provide tool name as `update_user`
-        raise NotImplementedError()
+        return "update_user"
 
     @property
     def description(self) -> str:
-        #TODO: Provide description of this tool
-        raise NotImplementedError()
+        return "Updates user info by user ID"
 
     @property
     def input_schema(self) -> dict[str, Any]:
-        #TODO:
-        # Provide tool params Schema:
-        # - id: number, required, User ID that should be updated.
-        # - new_info: UserUpdate.model_json_schema()
-        raise NotImplementedError()
-
-    def execute(self, arguments: dict[str, Any]) -> str:
-        #TODO:
-        # 1. Get user `id` from `arguments`
-        # 2. Get `new_info` from `arguments` and create `UserUpdate` via pydentic `UserUpdate.model_validate`
-        # 3. Call user_client update_user and return its results (it is async, don't forget to await)
-        raise NotImplementedError()
+        return UserUpdateRequest.model_json_schema()
 
+    @property
+    def arguments_model(self) -> type[UserUpdateRequest]:
+        return UserUpdateRequest
+
+    async def execute(self, arguments: UserUpdateRequest) -> str:
+        applied = await self._user_writes.update_user(arguments.id, arguments.new_info)
+        return await applied
\ No newline at end of file
@@ -0,0 +1,192 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+# Cache of users looked up by id, disabled when TTL is 0
+USER_CACHE_TTL = float(os.getenv("USERS_CACHE_TTL", "0"))
+USER_CACHE_SIZE = int(os.getenv("USERS_CACHE_SIZE", "10000"))
+# Expired entry is still served for this long (seconds) while it is reloaded in background
+USER_CACHE_STALE_TTL = float(os.getenv("USERS_CACHE_STALE_TTL", "30"))
+# Entry with at least this many lookups in the last refresh interval is hot and reloaded before it expires
+USER_CACHE_HOT_HITS = int(os.getenv("USERS_CACHE_HOT_HITS", "3"))
+USER_CACHE_REFRESH_CONCURRENCY = int(os.getenv("USERS_CACHE_REFRESH_CONCURRENCY", "8"))
+# Comma separated user ids loaded into cache on startup
+USER_PREWARM_IDS = [int(user_id) for user_id in os.getenv("USERS_PREWARM_IDS", "").split(",") if user_id.strip()]
+
+
+class _CacheEntry:
+
+    def __init__(self, value: dict[str, Any], expires_at: float):
+        self.value = value
+        self.expires_at = expires_at
+        # Decayed lookup counter, halved on every refresh pass
+        self.hits = 0.0
+
+
+class UserCache:
+    """
+    TTL cache of users by id with stale-while-revalidate.
+
+    Lookups are counted per entry; a background refresher wakes up every quarter of TTL and reloads hot entries
+    (at least `hot_hits` recent lookups) which would expire before its next pass, so popular users are never
+    fetched on the request path. Other expired entries are served stale for `stale_ttl` while reloaded in
+    background. Concurrent misses of the same id share one upstream request.
+    """
+
+    def __init__(
+            self,
+            fetch: Callable[[int], Awaitable[dict[str, Any]]],
+            ttl: float = USER_CACHE_TTL,
+            max_size: int = USER_CACHE_SIZE,
+            stale_ttl: float = USER_CACHE_STALE_TTL,
+            hot_hits: int = USER_CACHE_HOT_HITS,
+            refresh_concurrency: int = USER_CACHE_REFRESH_CONCURRENCY,
+    ):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.max_size = max_size
+        self.stale_ttl = stale_ttl
+        self.hot_hits = hot_hits
+        self.refresh_concurrency = refresh_concurrency
+        self.refresh_interval = ttl / 4
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "refreshed": 0, "refresh_failed": 0}
+        self._entries: OrderedDict[int, _CacheEntry] = OrderedDict()
+        # In-flight fetches, result is stored only if fetch was not invalidated meanwhile
+        self._fetches: dict[int, asyncio.Future] = {}
+        # Lookups waiting for in-flight fetch started on miss; background reloads are not here and never cancelled
+        self._waiters: dict[asyncio.Future, int] = {}
+        self._refresher: Optional[asyncio.Task] = None
+
+    async def get(self, user_id: int) -> dict[str, Any]:
+        self._ensure_refresher()
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            self._entries.move_to_end(user_id)
+            entry.hits += 1
+            now = time.monotonic()
+            if now < entry.expires_at:
+                self.stats["hits"] += 1
+                return entry.value
+            if now < entry.expires_at + self.stale_ttl:
+                self.stats["stale"] += 1
+                if user_id not in self._fetches:
+                    self._start_fetch(user_id).add_done_callback(self._log_refresh)
+                return entry.value
+
+        self.stats["misses"] += 1
+        fetch = self._fetches.get(user_id) or self._start_fetch(user_id, background=False)
+        if fetch in self._waiters:
+            self._waiters[fetch] += 1
+        try:
+            # Shielded: cancelled lookup must not cancel fetch shared with other callers...
+            return await asyncio.shield(fetch)
+        except asyncio.CancelledError:
+            # ...but when the last of them gives up (cancelled, timed out), upstream request is aborted
+            if fetch in self._waiters:
+                self._waiters[fetch] -= 1
+                if not self._waiters[fetch]:
+                    self._cancel_fetch(user_id, fetch)
+            raise
+
+    async def prewarm(self, user_ids: list[int]) -> None:
+        """Load users in bulk (bounded concurrency), failed ids are reported and skipped"""
+        self._ensure_refresher()
+        semaphore = asyncio.Semaphore(self.refresh_concurrency)
+
+        async def load(user_id: int) -> None:
+            async with semaphore:
+                await self._background_fetch(user_id)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(load(user_id) for user_id in user_ids), return_exceptions=True)
+        failed = [user_id for user_id, result in zip(user_ids, results) if isinstance(result, Exception)]
+        print(f"Prewarmed {len(user_ids) - len(failed)} users in {time.perf_counter() - started:.2f}s"
+              + (f", failed ids: {failed}" if failed else ""))
+
+    def invalidate(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+        self._fetches.pop(user_id, None)
+
+    async def close(self) -> None:
+        if self._refresher is not None:
+            self._refresher.cancel()
+            self._refresher = None
+
+    def _start_fetch(self, user_id: int, background: bool = True) -> asyncio.Future:
+        fetch = asyncio.ensure_future(self.fetch(user_id))
+        self._fetches[user_id] = fetch
+        if not background:
+            self._waiters[fetch] = 0
+        fetch.add_done_callback(lambda _: self._store(user_id, fetch))
+        return fetch
+
+    def _background_fetch(self, user_id: int) -> asyncio.Future:
+        """In-flight fetch of the user (started if there is none), not cancelled when lookups waiting for it give up"""
+        fetch = self._fetches.get(user_id) or self._start_fetch(user_id)
+        self._waiters.pop(fetch, None)
+        return fetch
+
+    def _cancel_fetch(self, user_id: int, fetch: asyncio.Future) -> None:
+        del self._waiters[fetch]
+        # Forgotten right away, so that the next lookup starts a new fetch instead of joining cancelled one
+        if self._fetches.get(user_id) is fetch:
+            del self._fetches[user_id]
+        fetch.cancel()
+
+    def _store(self, user_id: int, fetch: asyncio.Future) -> None:
+        self._waiters.pop(fetch, None)
+        if self._fetches.get(user_id) is not fetch:
+            return
+        del self._fetches[user_id]
+        if fetch.cancelled() or fetch.exception() is not None:
+            return
+
+        entry = self._entries.get(user_id)
+        if entry is None:
+            entry = self._entries[user_id] = _CacheEntry(fetch.result(), 0.0)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        entry.value = fetch.result()
+        entry.expires_at = time.monotonic() + self.ttl
+
+    def _log_refresh(self, fetch: asyncio.Future) -> None:
+        if fetch.cancelled() or fetch.exception() is not None:
+            self.stats["refresh_failed"] += 1
+        else:
+            self.stats["refreshed"] += 1
+
+    def _ensure_refresher(self) -> None:
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.create_task(self._refresh_periodically())
+
+    async def _refresh_periodically(self) -> None:
+        semaphore = asyncio.Semaphore(self.refresh_concurrency)
+
+        async def refresh(user_id: int) -> None:
+            async with semaphore:
+                fetch = self._background_fetch(user_id)
+                try:
+                    await asyncio.shield(fetch)
+                except Exception as e:
+                    # Entry stays until it expires, next pass or lookup retries
+                    print(f"Failed to refresh user {user_id}: {e}")
+                self._log_refresh(fetch)
+
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            # Entries expiring before the next pass are reloaded now
+            now = time.monotonic()
+            refresh_before = now + self.refresh_interval * 1.5
+            hot, dead = [], []
+            for user_id, entry in self._entries.items():
+                if entry.hits >= self.hot_hits and entry.expires_at < refresh_before:
+                    hot.append(user_id)
+                elif entry.expires_at + self.stale_ttl < now:
+                    dead.append(user_id)
+                entry.hits /= 2
+            for user_id in dead:
+                del self._entries[user_id]
+            if hot:
+                await asyncio.gather(*(refresh(user_id) for user_id in hot))
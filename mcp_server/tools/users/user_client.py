@@ -1,40 +1,64 @@
 import os
 from typing import Any, Optional
 
-import requests
+import aiohttp
 
 from mcp_server.models.user_info import UserUpdate, UserCreate
+from mcp_server.services.process_pool import ProcessPool
+from mcp_server.tools.users.user_cache import USER_CACHE_TTL, USER_PREWARM_IDS, UserCache
+from mcp_server.tools.users.user_formatter import MARKDOWN_FORMAT, format_user, format_users_payload
 
 USER_SERVICE_ENDPOINT = os.getenv("USERS_MANAGEMENT_SERVICE_URL", "http://localhost:8041")
 
 class UserClient:
+    """
+    Async client of users management service.
+    Requests are awaited on aiohttp, so cancelling the calling task (client cancellation, timeout) aborts
+    the upstream HTTP request as well.
+    With `USERS_CACHE_TTL` set, users looked up by id are cached (see UserCache), updates and deletes invalidate them.
+    Large search results are parsed and formatted in process pool.
+    """
+
+    def __init__(self, process_pool: ProcessPool):
+        self._process_pool = process_pool
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._cache = UserCache(self._fetch_user) if USER_CACHE_TTL > 0 else None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        # Session is created lazily, it must be bound to the running event loop
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(headers={"Content-Type": "application/json"})
+        return self._session
+
+    async def warm_up(self) -> None:
+        """Load `USERS_PREWARM_IDS` into cache"""
+        if self._cache is not None and USER_PREWARM_IDS:
+            await self._cache.prewarm(USER_PREWARM_IDS)
+
+    async def close(self) -> None:
+        if self._cache is not None:
+            await self._cache.close()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def get_user(
+            self,
+            user_id: int,
+            output_format: str = MARKDOWN_FORMAT,
+            fields: Optional[list[str]] = None
+    ) -> str:
+        data = await (self._cache.get(user_id) if self._cache is not None else self._fetch_user(user_id))
+        return format_user(data, output_format, fields)
 
-    def __user_to_string(self, user: dict[str, Any]):
-        user_str = "```\n"
-        for key, value in user.items():
-            user_str += f"  {key}: {value}\n"
-        user_str += "```\n"
-
-        return user_str
-
-    def __users_to_string(self, users: list[dict[str, Any]]):
-        users_str = ""
-        for value in users:
-            users_str += self.__user_to_string(value)
-        users_str += "\n"
-
-        return users_str
-
-    async def get_user(self, user_id: int) -> str:
-        headers = {"Content-Type": "application/json"}
-
-        response = requests.get(url=f"{USER_SERVICE_ENDPOINT}/v1/users/{user_id}", headers=headers)
+    async def _fetch_user(self, user_id: int) -> dict[str, Any]:
+        session = await self._get_session()
 
-        if response.status_code == 200:
-            data = response.json()
-            return self.__user_to_string(data)
+        async with session.get(url=f"{USER_SERVICE_ENDPOINT}/v1/users/{user_id}") as response:
+            if response.status == 200:
+                return await response.json()
 
-        raise Exception(f"HTTP {response.status_code}: {response.text}")
+            raise Exception(f"HTTP {response.status}: {await response.text()}")
 
     async def search_users(
             self,
@@ -42,8 +66,10 @@ class UserClient:
             surname: Optional[str] = None,
             email: Optional[str] = None,
             gender: Optional[str] = None,
+            output_format: str = MARKDOWN_FORMAT,
+            fields: Optional[list[str]] = None,
     ) -> str:
-        headers = {"Content-Type": "application/json"}
+        session = await self._get_session()
 
         params = {}
         if name:
@@ -55,49 +81,45 @@ class UserClient:
         if gender:
             params["gender"] = gender
 
-        response = requests.get(url=USER_SERVICE_ENDPOINT + "/v1/users/search", headers=headers, params=params)
-
-        if response.status_code == 200:
-            data = response.json()
-            print(f"Get {len(data)} users successfully")
-            return self.__users_to_string(data)
+        async with session.get(url=USER_SERVICE_ENDPOINT + "/v1/users/search", params=params) as response:
+            if response.status == 200:
+                payload = await response.read()
+                result = await self._process_pool.run(format_users_payload, payload, output_format, fields)
+                print(f"Get users successfully ({len(payload)} bytes)")
+                return result.decode("utf-8")
 
-        raise Exception(f"HTTP {response.status_code}: {response.text}")
+            raise Exception(f"HTTP {response.status}: {await response.text()}")
 
     async def add_user(self, user_create_model: UserCreate) -> str:
-        headers = {"Content-Type": "application/json"}
-
-        response = requests.post(
-            url=f"{USER_SERVICE_ENDPOINT}/v1/users",
-            headers=headers,
-            json=user_create_model.model_dump()
-        )
+        session = await self._get_session()
 
-        if response.status_code == 201:
-            return f"User successfully added: {response.text}"
+        async with session.post(url=f"{USER_SERVICE_ENDPOINT}/v1/users", json=user_create_model.model_dump()) as response:
+            if response.status == 201:
+                return f"User successfully added: {await response.text()}"
 
-        raise Exception(f"HTTP {response.status_code}: {response.text}")
+            raise Exception(f"HTTP {response.status}: {await response.text()}")
 
     async def update_user(self, user_id: int, user_update_model: UserUpdate) -> str:
-        headers = {"Content-Type": "application/json"}
+        session = await self._get_session()
 
-        response = requests.put(
-            url=f"{USER_SERVICE_ENDPOINT}/v1/users/{user_id}",
-            headers=headers,
-            json=user_update_model.model_dump()
-        )
+        async with session.put(
+                url=f"{USER_SERVICE_ENDPOINT}/v1/users/{user_id}",
+                json=user_update_model.model_dump()
+        ) as response:
+            if response.status == 201:
+                if self._cache is not None:
+                    self._cache.invalidate(user_id)
+                return f"User successfully updated: {await response.text()}"
 
-        if response.status_code == 201:
-            return f"User successfully updated: {response.text}"
-
-        raise Exception(f"HTTP {response.status_code}: {response.text}")
+            raise Exception(f"HTTP {response.status}: {await response.text()}")
 
     async def delete_user(self, user_id: int) -> str:
-        headers = {"Content-Type": "application/json"}
-
-        response = requests.delete(url=f"{USER_SERVICE_ENDPOINT}/v1/users/{user_id}", headers=headers)
+        session = await self._get_session()
 
-        if response.status_code == 204:
-            return "User successfully deleted"
+        async with session.delete(url=f"{USER_SERVICE_ENDPOINT}/v1/users/{user_id}") as response:
+            if response.status == 204:
+                if self._cache is not None:
+                    self._cache.invalidate(user_id)
+                return "User successfully deleted"
 
-        raise Exception(f"HTTP {response.status_code}: {response.text}")
+            raise Exception(f"HTTP {response.status}: {await response.text()}")
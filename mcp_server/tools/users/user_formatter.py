@@ -0,0 +1,87 @@
+import json
+from typing import Any, Optional
+
+MARKDOWN_FORMAT = "markdown"
+JSON_FORMAT = "json"
+TABLE_FORMAT = "table"
+OUTPUT_FORMATS = [MARKDOWN_FORMAT, JSON_FORMAT, TABLE_FORMAT]
+
+OUTPUT_FORMAT_SCHEMA = {
+    "type": "string",
+    "enum": OUTPUT_FORMATS,
+    "description": "Result format: `markdown` (default, block per user), `json` (compact JSON) or "
+                   "`table` (header with field names once, then one `|`-separated row per user, the most compact)"
+}
+FIELDS_SCHEMA = {
+    "type": "array",
+    "items": {"type": "string"},
+    "description": "User fields to return (e.g. [\"id\", \"name\", \"email\"]), all fields by default"
+}
+
+
+def _select_fields(user: dict[str, Any], fields: Optional[list[str]]) -> dict[str, Any]:
+    if not fields:
+        return user
+    return {field: user[field] for field in fields if field in user}
+
+
+def _user_to_markdown(user: dict[str, Any]) -> str:
+    return "```\n" + "".join(f"  {key}: {value}\n" for key, value in user.items()) + "```\n"
+
+
+# json.dumps with non-default options builds new encoder on every call
+_to_compact_json = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+_CELL_ESCAPES = str.maketrans({"\\": "\\\\", "|": "\\|", "\n": "\\n"})
+
+
+def _escape_cell(text: str) -> str:
+    return text.translate(_CELL_ESCAPES) if "|" in text or "\n" in text or "\\" in text else text
+
+
+def _table_cell(value: Any) -> str:
+    value_type = type(value)
+    if value_type is str:
+        return _escape_cell(value)
+    if value_type is int or value_type is float:
+        return str(value)
+    if value is None:
+        return ""
+    if value_type is dict or value_type is list:
+        return _escape_cell(_to_compact_json(value))
+    return _escape_cell(str(value))
+
+
+def _users_to_table(users: list[dict[str, Any]]) -> str:
+    # Columns are union of keys in order of first appearance, so shared keys are written only once
+    columns = list(dict.fromkeys(key for user in users for key in user))
+    lines = ["|".join(columns)]
+    for user in users:
+        lines.append("|".join([_table_cell(user.get(column)) for column in columns]))
+    return "\n".join(lines) + "\n"
+
+
+def format_user(user: dict[str, Any], output_format: str = MARKDOWN_FORMAT, fields: Optional[list[str]] = None) -> str:
+    user = _select_fields(user, fields)
+    if output_format == JSON_FORMAT:
+        return _to_compact_json(user)
+    if output_format == TABLE_FORMAT:
+        return _users_to_table([user])
+    return _user_to_markdown(user)
+
+
+def format_users(
+        users: list[dict[str, Any]],
+        output_format: str = MARKDOWN_FORMAT,
+        fields: Optional[list[str]] = None
+) -> str:
+    users = [_select_fields(user, fields) for user in users]
+    if output_format == JSON_FORMAT:
+        return _to_compact_json(users)
+    if output_format == TABLE_FORMAT:
+        return _users_to_table(users) if users else ""
+    return "".join(_user_to_markdown(user) for user in users) + "\n"
+
+
+def format_users_payload(payload: bytes, output_format: str = MARKDOWN_FORMAT, fields: Optional[list[str]] = None) -> bytes:
+    """`format_users` of raw users service response, runs in process pool for large results"""
+    return format_users(json.loads(payload), output_format, fields).encode("utf-8")
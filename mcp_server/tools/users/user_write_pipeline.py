@@ -0,0 +1,199 @@
+import asyncio
+import itertools
+import os
+from collections import Counter, deque
+from typing import Any, Hashable, Optional
+
+from mcp_server.models.user_info import UserCreate, UserUpdate
+from mcp_server.tools.users.user_client import UserClient
+
+WRITE_BATCHING = os.getenv("USERS_WRITE_BATCHING", "false").lower() == "true"
+WRITE_BATCH_SIZE = int(os.getenv("USERS_WRITE_BATCH_SIZE", "50"))
+WRITE_CONCURRENCY = int(os.getenv("USERS_WRITE_CONCURRENCY", "8"))
+WRITE_LINGER = float(os.getenv("USERS_WRITE_LINGER", "0.005"))
+WRITE_MAX_PENDING = int(os.getenv("USERS_WRITE_MAX_PENDING", "1000"))
+# `wait` blocks new writes while queue is full, `reject` fails them right away
+WRITE_BACKPRESSURE = os.getenv("USERS_WRITE_BACKPRESSURE", "wait")
+
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+
+
+class WriteQueueFull(Exception):
+    """Raised in `reject` backpressure mode when write queue already holds `max_pending` writes"""
+
+
+class _PendingWrite:
+
+    def __init__(self, key: Hashable, kind: str, user_id: Optional[int], payload: Any):
+        self.key = key
+        self.kind = kind
+        self.user_id = user_id
+        self.payload = payload
+        self.in_flight = False
+        self.applied = asyncio.Event()
+        # One future per caller, merged updates resolve all of them with the same result
+        self.futures: list[asyncio.Future] = []
+
+    def merge(self, user_update_model: UserUpdate) -> None:
+        self.payload = UserUpdate.model_validate({
+            **self.payload.model_dump(exclude_unset=True),
+            **user_update_model.model_dump(exclude_unset=True),
+        })
+
+
+class UserWritePipeline:
+    """
+    Write-behind queue in front of UserClient for add/update/delete.
+
+    Writes are queued per user id and flushed in batches of up to `batch_size` writes (the oldest pending write
+    of each user), at most `concurrency` upstream requests at a time. A batch is finished before the next one
+    is taken, so writes to the same user are applied in submission order. Updates of a user which are still
+    waiting in the queue are merged into one request, unless another write of that user waits for a queue slot.
+    Each caller gets a future resolved when its write is applied; cancelling the caller doesn't cancel the write.
+    Disabled by default (`USERS_WRITE_BATCHING`), then writes go straight to UserClient.
+    """
+
+    def __init__(
+            self,
+            user_client: UserClient,
+            enabled: bool = WRITE_BATCHING,
+            batch_size: int = WRITE_BATCH_SIZE,
+            concurrency: int = WRITE_CONCURRENCY,
+            linger: float = WRITE_LINGER,
+            max_pending: int = WRITE_MAX_PENDING,
+            backpressure: str = WRITE_BACKPRESSURE,
+    ):
+        if backpressure not in ("wait", "reject"):
+            raise ValueError(f"Unknown backpressure mode '{backpressure}', expected 'wait' or 'reject'")
+
+        self.user_client = user_client
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.linger = linger
+        self.max_pending = max_pending
+        self.backpressure = backpressure
+        self.stats = {"writes": 0, "merged": 0, "batches": 0, "rejected": 0}
+        self._queues: dict[Hashable, deque[_PendingWrite]] = {}
+        # Writes waiting for a queue slot per key, nothing is merged past them (that would reorder writes)
+        self._waiting: Counter[Hashable] = Counter()
+        self._create_keys = itertools.count()
+        self._slots = asyncio.Semaphore(max_pending)
+        self._has_writes = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def add_user(self, user_create_model: UserCreate) -> asyncio.Future:
+        if not self.enabled:
+            return asyncio.ensure_future(self.user_client.add_user(user_create_model))
+        # Creates have no id yet, each one is independent
+        return await self._submit(("create", next(self._create_keys)), CREATE, None, user_create_model)
+
+    async def update_user(self, user_id: int, user_update_model: UserUpdate) -> asyncio.Future:
+        if not self.enabled:
+            return asyncio.ensure_future(self.user_client.update_user(user_id, user_update_model))
+        return await self._submit(user_id, UPDATE, user_id, user_update_model)
+
+    async def delete_user(self, user_id: int) -> asyncio.Future:
+        if not self.enabled:
+            return asyncio.ensure_future(self.user_client.delete_user(user_id))
+        return await self._submit(user_id, DELETE, user_id, None)
+
+    async def flush(self) -> None:
+        """Wait until all writes submitted so far are applied"""
+        while self._queues:
+            await asyncio.gather(*(write.applied.wait() for queue in list(self._queues.values()) for write in queue))
+
+    async def close(self) -> None:
+        await self.flush()
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+
+    async def _submit(self, key: Hashable, kind: str, user_id: Optional[int], payload: Any) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self.stats["writes"] += 1
+
+        queue = self._queues.get(key)
+        if (kind == UPDATE and queue and queue[-1].kind == UPDATE and not queue[-1].in_flight
+                and not self._waiting[key]):
+            # Merged write takes no extra slot in the queue
+            queue[-1].merge(payload)
+            queue[-1].futures.append(future)
+            self.stats["merged"] += 1
+            return future
+
+        if self.backpressure == "reject" and self._slots.locked():
+            self.stats["rejected"] += 1
+            raise WriteQueueFull(f"User write queue is full ({self.max_pending} pending writes)")
+        self._waiting[key] += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting[key] -= 1
+            if not self._waiting[key]:
+                del self._waiting[key]
+
+        write = _PendingWrite(key, kind, user_id, payload)
+        write.futures.append(future)
+        self._queues.setdefault(key, deque()).append(write)
+        self._has_writes.set()
+
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+        return future
+
+    async def _flush_loop(self) -> None:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def apply_limited(write: _PendingWrite) -> None:
+            async with semaphore:
+                await self._apply(write)
+
+        while True:
+            await self._has_writes.wait()
+            # Let a burst of writes accumulate into one batch
+            if self.linger and len(self._queues) < self.batch_size:
+                await asyncio.sleep(self.linger)
+
+            batch = [queue[0] for queue in itertools.islice(self._queues.values(), self.batch_size)]
+            if not batch:
+                self._has_writes.clear()
+                continue
+
+            for write in batch:
+                write.in_flight = True
+            self.stats["batches"] += 1
+            await asyncio.gather(*(apply_limited(write) for write in batch))
+
+    async def _apply(self, write: _PendingWrite) -> None:
+        try:
+            if write.kind == CREATE:
+                result = await self.user_client.add_user(write.payload)
+            elif write.kind == UPDATE:
+                result = await self.user_client.update_user(write.user_id, write.payload)
+            else:
+                result = await self.user_client.delete_user(write.user_id)
+        except Exception as e:
+            for future in write.futures:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for future in write.futures:
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._complete(write)
+
+    def _complete(self, write: _PendingWrite) -> None:
+        queue = self._queues[write.key]
+        queue.popleft()
+        if not queue:
+            del self._queues[write.key]
+        self._slots.release()
+        write.applied.set()
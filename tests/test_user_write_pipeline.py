@@ -0,0 +1,47 @@
+import asyncio
+
+from mcp_server.models.user_info import UserUpdate
+from mcp_server.tools.users.user_write_pipeline import UserWritePipeline
+
+
+class _RecordingUserClient:
+    """Applies writes in order they reach users service, without network"""
+
+    def __init__(self):
+        self.applied: list[tuple] = []
+
+    async def update_user(self, user_id: int, user_update_model: UserUpdate) -> str:
+        await asyncio.sleep(0.001)
+        self.applied.append(("update", user_id, user_update_model.model_dump(exclude_unset=True)))
+        return "updated"
+
+    async def delete_user(self, user_id: int) -> str:
+        await asyncio.sleep(0.001)
+        self.applied.append(("delete", user_id))
+        return "deleted"
+
+
+def test_update_is_not_merged_past_write_waiting_for_slot():
+    async def scenario() -> list[tuple]:
+        user_client = _RecordingUserClient()
+        pipeline = UserWritePipeline(user_client, enabled=True, max_pending=2, backpressure="wait", linger=0.01)
+
+        first_update = await pipeline.update_user(1, UserUpdate(name="a"))
+        other_update = await pipeline.update_user(2, UserUpdate(name="c"))
+        # Queue is full, delete waits for a slot
+        delete = asyncio.create_task(pipeline.delete_user(1))
+        await asyncio.sleep(0)
+        last_update = asyncio.create_task(pipeline.update_user(1, UserUpdate(name="b")))
+
+        futures = [first_update, other_update, await delete, await last_update]
+        await asyncio.gather(*futures)
+        await pipeline.close()
+        return user_client.applied
+
+    applied = asyncio.run(scenario())
+
+    assert [write for write in applied if write[1] == 1] == [
+        ("update", 1, {"name": "a"}),
+        ("delete", 1),
+        ("update", 1, {"name": "b"}),
+    ]